@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Check relative links and `#anchor` references across the docs tree.
+
+How it works:
+- One parallel pass parses every markdown file under `--root` into an index of
+  heading anchors (GitHub slug rules, incl. `-1`/`-2` suffixes for duplicate
+  headings and explicit `<a name=...>`/`id=...` anchors) plus the links it holds.
+- Every link is then resolved against that in-memory index; target files are
+  never re-parsed per link.
+- The index is cached on disk keyed by file content hash (with a size/mtime
+  fast path), so re-runs only re-scan files that actually changed.
+
+Links inside fenced code blocks and inline code spans are ignored. External
+links (`http:`, `mailto:`, ...) are not checked.
+
+Usage:
+  python check-doc-links.py                      # check docs/ (this script's parent)
+  python check-doc-links.py --root ../ --jobs 8  # check the whole repo
+  python check-doc-links.py --no-cache -v
+
+Exit codes: 0 = all links resolve, 1 = broken links found, 2 = usage error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+DOCS_ROOT = Path(__file__).resolve().parent.parent
+CACHE_NAME = ".doc-link-index.json"
+CACHE_VERSION = 1
+
+# Below this many changed files the process pool costs more than it saves.
+PARALLEL_THRESHOLD = 32
+
+FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+ATX_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+SETEXT_RE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+HTML_ANCHOR_RE = re.compile(r"""<a\s[^>]*?(?:name|id)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+INLINE_CODE_RE = re.compile(r"(`+)(?:.+?)\1")
+LINK_RE = re.compile(r"!?\[(?:[^\[\]]|\[[^\]]*\])*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+REF_DEF_RE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(?:\s+.*)?$")
+SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+MD_LINK_TEXT_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+SLUG_STRIP_RE = re.compile(r"[^\w\- ]", re.UNICODE)
+
+
+@dataclass
+class FileEntry:
+    digest: str
+    size: int
+    mtime_ns: int
+    anchors: List[str]
+    links: List[Tuple[int, str]]  # (line number, raw target)
+
+
+@dataclass
+class BrokenLink:
+    source: str
+    line: int
+    target: str
+    reason: str
+
+
+def slugify_heading(text: str) -> str:
+    """GitHub-style heading slug (without duplicate suffixes)."""
+    text = MD_LINK_TEXT_RE.sub(r"\1", text)
+    text = HTML_TAG_RE.sub("", text)
+    text = SLUG_STRIP_RE.sub("", text.strip().lower())
+    return text.replace(" ", "-")
+
+
+def parse_markdown(text: str) -> Tuple[List[str], List[Tuple[int, str]]]:
+    anchors: List[str] = []
+    links: List[Tuple[int, str]] = []
+    seen: Dict[str, int] = {}
+
+    def add_heading(raw: str) -> None:
+        if "<a" in raw:
+            anchors.extend(m.group(1) for m in HTML_ANCHOR_RE.finditer(raw))
+        slug = slugify_heading(raw)
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        anchors.append(slug if count == 0 else f"{slug}-{count}")
+
+    fence: Optional[str] = None
+    prev = ""
+    prev_is_para = False
+    for lineno, line in enumerate(text.splitlines(), 1):
+        # Cheap first-character checks keep the regexes off the vast majority of lines.
+        head = line.lstrip()[:1]
+        fm = FENCE_RE.match(line) if head in ("`", "~") else None
+        if fence is not None:
+            if fm and fm.group(1)[0] == fence[0] and len(fm.group(1)) >= len(fence):
+                fence = None
+            prev_is_para = False
+            continue
+        if fm:
+            fence = fm.group(1)
+            prev_is_para = False
+            continue
+
+        hm = ATX_RE.match(line) if head == "#" else None
+        if hm:
+            add_heading(hm.group(2))
+            prev_is_para = False
+        elif prev_is_para and head in ("=", "-") and SETEXT_RE.match(line):
+            add_heading(prev)
+            prev_is_para = False
+        else:
+            if "<a" in line:
+                anchors.extend(m.group(1) for m in HTML_ANCHOR_RE.finditer(line))
+            prev_is_para = bool(head) and head not in "|>-*+<"
+            prev = line
+
+        if "](" in line:
+            code_free = INLINE_CODE_RE.sub("", line) if "`" in line else line
+            links.extend((lineno, m.group(1)) for m in LINK_RE.finditer(code_free))
+        if head == "[" and "]:" in line:
+            rm = REF_DEF_RE.match(INLINE_CODE_RE.sub("", line))
+            if rm:
+                links.append((lineno, rm.group(1)))
+    return anchors, links
+
+
+def scan_file(path: str) -> Tuple[str, FileEntry]:
+    p = Path(path)
+    data = p.read_bytes()
+    st = p.stat()
+    anchors, links = parse_markdown(data.decode("utf-8", errors="replace"))
+    entry = FileEntry(hashlib.sha256(data).hexdigest(), st.st_size, st.st_mtime_ns, anchors, links)
+    return path, entry
+
+
+def iter_markdown(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d not in ("node_modules", "bin", "obj")]
+        for name in filenames:
+            if name.lower().endswith(".md"):
+                yield Path(dirpath) / name
+
+
+def load_cache(cache_path: Path) -> Dict[str, FileEntry]:
+    try:
+        raw = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if raw.get("version") != CACHE_VERSION:
+        return {}
+    return {
+        k: FileEntry(v["digest"], v["size"], v["mtime_ns"], v["anchors"], [tuple(l) for l in v["links"]])
+        for k, v in raw.get("files", {}).items()
+    }
+
+
+def save_cache(cache_path: Path, index: Dict[str, FileEntry]) -> None:
+    payload = {
+        "version": CACHE_VERSION,
+        "files": {k: vars(v) for k, v in index.items()},
+    }
+    tmp = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(cache_path)
+
+
+def build_index(root: Path, cache: Dict[str, FileEntry], jobs: Optional[int]) -> Tuple[Dict[str, FileEntry], int]:
+    """Return (index keyed by absolute path, number of files re-scanned)."""
+    index: Dict[str, FileEntry] = {}
+    stale: List[str] = []
+    for p in iter_markdown(root):
+        key = str(p)
+        cached = cache.get(key)
+        if cached is None:
+            stale.append(key)
+            continue
+        st = p.stat()
+        if cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+            index[key] = cached
+            continue
+        data = p.read_bytes()
+        if hashlib.sha256(data).hexdigest() == cached.digest:
+            cached.size, cached.mtime_ns = st.st_size, st.st_mtime_ns
+            index[key] = cached
+        else:
+            stale.append(key)
+
+    if len(stale) >= PARALLEL_THRESHOLD and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for key, entry in pool.map(scan_file, stale, chunksize=max(1, len(stale) // 64)):
+                index[key] = entry
+    else:
+        for key in stale:
+            index[key] = scan_file(key)[1]
+    return index, len(stale)
+
+
+def resolve_links(root: Path, index: Dict[str, FileEntry]) -> List[BrokenLink]:
+    anchor_sets = {k: set(v.anchors) for k, v in index.items()}
+    exists_cache: Dict[str, bool] = {}
+
+    def exists(path: str) -> bool:
+        if path not in exists_cache:
+            exists_cache[path] = os.path.exists(path)
+        return exists_cache[path]
+
+    def anchors_for(path: str) -> Optional[set]:
+        # Markdown outside the scanned root (e.g. ../README.md) is parsed on demand, once.
+        if path not in anchor_sets:
+            if not path.lower().endswith(".md") or not os.path.isfile(path):
+                return None
+            anchor_sets[path] = set(scan_file(path)[1].anchors)
+        return anchor_sets[path]
+
+    broken: List[BrokenLink] = []
+    for source in sorted(index):
+        base = os.path.dirname(source)
+        for line, target in index[source].links:
+            if SCHEME_RE.match(target) or target.startswith("//"):
+                continue
+            path_part, _, fragment = target.partition("#")
+            path_part = unquote(path_part.split("?", 1)[0])
+            if not path_part:
+                dest = source
+            elif path_part.startswith("/"):
+                dest = os.path.normpath(os.path.join(str(root), path_part.lstrip("/")))
+            else:
+                dest = os.path.normpath(os.path.join(base, path_part))
+
+            rel = os.path.relpath(source, root)
+            if not exists(dest):
+                broken.append(BrokenLink(rel, line, target, "missing file"))
+                continue
+            if fragment:
+                anchors = anchors_for(dest)
+                if anchors is not None and unquote(fragment).lower() not in anchors and fragment not in anchors:
+                    broken.append(BrokenLink(rel, line, target, "missing anchor"))
+    return broken
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Check relative links and anchors in markdown docs.")
+    ap.add_argument("--root", default=str(DOCS_ROOT), help="Directory to scan (default: docs/)")
+    ap.add_argument("--cache", default=None, help=f"Index cache path (default: <root>/{CACHE_NAME})")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore and do not write the index cache")
+    ap.add_argument("--jobs", type=int, default=None, help="Worker processes for scanning (default: CPU count)")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Print timing and index statistics")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root).resolve()
+    if not root.is_dir():
+        print(f"error: root is not a directory: {root}", file=sys.stderr)
+        return 2
+    cache_path = Path(args.cache).resolve() if args.cache else root / CACHE_NAME
+
+    t0 = time.perf_counter()
+    cache = {} if args.no_cache else load_cache(cache_path)
+    index, rescanned = build_index(root, cache, args.jobs)
+    t1 = time.perf_counter()
+    broken = resolve_links(root, index)
+    t2 = time.perf_counter()
+    if not args.no_cache:
+        save_cache(cache_path, index)
+
+    for b in broken:
+        print(f"{b.source}:{b.line}: {b.reason}: {b.target}")
+
+    if args.verbose:
+        n_links = sum(len(e.links) for e in index.values())
+        n_anchors = sum(len(e.anchors) for e in index.values())
+        print(
+            f"{len(index)} files ({rescanned} re-scanned), {n_anchors} anchors, {n_links} links; "
+            f"index {t1 - t0:.3f}s, resolve {t2 - t1:.3f}s, {len(broken)} broken",
+            file=sys.stderr,
+        )
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
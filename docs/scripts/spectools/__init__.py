@@ -0,0 +1,21 @@
+"""Importable spec tooling for Agentic Coding Bot (Acode).
+
+Backs `generate-acode-task-stubs.py` and `generate-refinable-tasks-acode-v2.py`.
+Importing the package has no side effects: no directories are created, no
+files are read, and regexes/templates are built on first use.
+
+Run `python -m spectools --help` from `docs/scripts/` for the CLI, including
+the persistent JSON-RPC daemon (`serve`), the startup benchmark (`bench`),
+Merkle section-hash snapshots of the spec corpus (`snapshot`) and the task
+dependency waves used to parallelise generation and refinement (`schedule`).
+"""
+
+from .tasklist import Task, TaskModel, TaskModelCache, load_task_list, parse_task_list
+
+__all__ = [
+    "Task",
+    "TaskModel",
+    "TaskModelCache",
+    "load_task_list",
+    "parse_task_list",
+]
@@ -0,0 +1,213 @@
+"""Command line entry point: `python -m spectools <command>` (run from docs/scripts).
+
+Commands:
+  stubs   --task-list PATH --out DIR [--wave N]   write NEEDS-REFINEMENT stubs
+  refine  --in DIR --out DIR --mode all --task-list PATH [--wave N]
+  parse   --task-list PATH                        print the parsed task model as JSON
+  schedule [--json] [--allow-cycles]              dependency waves and critical path
+  serve   [--socket PATH]                         JSON-RPC daemon (stdin/stdout if no socket)
+  call    --socket PATH METHOD [JSON_PARAMS]      send one request to a running daemon
+  bench   [--runs N]                              startup-time benchmark
+  snapshot create SOURCE --name NAME              Merkle section-hash snapshot of a dir or .zip
+  snapshot diff OLD NEW [--show] [--json]         added/removed/changed sections between snapshots
+  snapshot list                                   list stored snapshots
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from .tasklist import DEFAULT_TASK_LIST
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog='spectools')
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('stubs', help='Generate task stubs from task-list.md')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+    p.add_argument('--out', dest='out_dir', required=True)
+    add_schedule_args(p, wave=True)
+
+    p = sub.add_parser('refine', help='Prepare refinement-ready documents from stubs')
+    p.add_argument('--in', dest='in_dir', default='.', help='Input directory (containing tasks/ and epics/)')
+    p.add_argument('--out', dest='out_dir', default='./refined', help='Output directory')
+    p.add_argument('--mode', choices=['tasks', 'epics', 'all'], default='all')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+    add_schedule_args(p, wave=True)
+
+    p = sub.add_parser('parse', help='Print the parsed task model as JSON')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+
+    p = sub.add_parser('schedule', help='Group tasks into dependency waves and report the critical path')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+    p.add_argument('--json', action='store_true', help='Print the schedule as JSON')
+    add_schedule_args(p, wave=False)
+
+    p = sub.add_parser('serve', help='Run the JSON-RPC daemon')
+    p.add_argument('--socket', default=None, help='Unix socket path (default: stdin/stdout)')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+
+    p = sub.add_parser('call', help='Send one request to a running daemon')
+    p.add_argument('--socket', required=True)
+    p.add_argument('method')
+    p.add_argument('params', nargs='?', default='{}', help='JSON object')
+
+    p = sub.add_parser('bench', help='Compare one-shot startup with a warm daemon')
+    p.add_argument('--task-list', dest='task_list', default=str(DEFAULT_TASK_LIST))
+    p.add_argument('--runs', type=int, default=10)
+
+    p = sub.add_parser('snapshot', help='Merkle section-hash snapshots of the spec corpus')
+    snap = p.add_subparsers(dest='snapshot_command', required=True)
+    sp = snap.add_parser('create', help='Snapshot a directory or .zip archive')
+    sp.add_argument('source')
+    sp.add_argument('--name', default=None, help='Ref name to record (default: print root hash only)')
+    sp = snap.add_parser('diff', help='Compare two snapshots (names or root hashes)')
+    sp.add_argument('old')
+    sp.add_argument('new')
+    sp.add_argument('--show', action='store_true', help='Print unified diffs of changed sections')
+    sp.add_argument('--json', action='store_true', help='Print changes as JSON')
+    snap.add_parser('list', help='List stored snapshots')
+    for sp in snap.choices.values():
+        sp.add_argument('--store', default=None, help='Object store directory (default: docs/.spec-snapshots)')
+
+    args = ap.parse_args(argv)
+
+    if args.command in ('stubs', 'refine', 'schedule'):
+        return _scheduled(args)
+    elif args.command == 'parse':
+        from .tasklist import load_task_list
+
+        json.dump({'tasks': [asdict(t) for t in load_task_list(Path(args.task_list)).tasks]}, sys.stdout)
+        sys.stdout.write("\n")
+    elif args.command == 'serve':
+        from .daemon import Dispatcher, serve_socket, serve_stdio
+
+        dispatcher = Dispatcher(Path(args.task_list))
+        if args.socket:
+            serve_socket(dispatcher, Path(args.socket))
+        else:
+            serve_stdio(dispatcher, sys.stdin, sys.stdout)
+    elif args.command == 'call':
+        from .daemon import RpcError, call
+
+        try:
+            result = call(Path(args.socket), args.method, json.loads(args.params))
+        except RpcError as e:
+            print(f"error {e.code}: {e.message}", file=sys.stderr)
+            return 1
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif args.command == 'bench':
+        from .bench import format_results, run_benchmark
+
+        print(format_results(run_benchmark(Path(args.task_list), args.runs)))
+    elif args.command == 'snapshot':
+        return _snapshot(args)
+    return 0
+
+
+def add_schedule_args(p: argparse.ArgumentParser, wave: bool) -> None:
+    """Add --specs/--allow-cycles (and --wave); shared with the generate-*.py wrappers."""
+    p.add_argument('--specs', action='append', default=None,
+                   help='Directory of existing specs whose **Dependencies:** headers are read '
+                        '(repeatable; default: docs/tasks/refined-tasks)')
+    p.add_argument('--allow-cycles', action='store_true', help='Keep dependency cycles together in one wave')
+    if wave:
+        p.add_argument('--wave', type=int, default=None, help='Only process tasks in this 1-based wave')
+
+
+def spec_dirs(args: argparse.Namespace) -> List[Path]:
+    from .schedule import DEFAULT_SPEC_DIR
+
+    return [Path(d) for d in args.specs] if args.specs else [DEFAULT_SPEC_DIR]
+
+
+def _scheduled(args: argparse.Namespace) -> int:
+    from .schedule import (CycleError, build_graph, build_schedule, describe_cycle,
+                           format_schedule, schedule_to_dict, wave_members)
+    from .tasklist import load_task_list
+
+    model = load_task_list(Path(args.task_list))
+    graph = build_graph(model, spec_dirs(args))
+    wave = getattr(args, 'wave', None)
+    try:
+        schedule = build_schedule(graph, args.allow_cycles) if args.command == 'schedule' or wave is not None else None
+        only = wave_members(schedule, wave) if wave is not None else None
+    except CycleError as e:
+        for members in e.cycles:
+            print(f"error: {describe_cycle(graph, members)}", file=sys.stderr)
+        print("Fix the **Dependencies:** headers or pass --allow-cycles.", file=sys.stderr)
+        return 1
+    except IndexError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.command == 'schedule':
+        if args.json:
+            json.dump(schedule_to_dict(schedule, graph), sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            print(format_schedule(schedule, graph))
+    elif args.command == 'stubs':
+        from .stubs import generate_stubs
+
+        for path in generate_stubs(model.tasks, Path(args.out_dir), graph, only):
+            print("Created", path)
+    else:
+        from .refine import refine_tree
+
+        out_dir = Path(args.out_dir).resolve()
+        refine_tree(Path(args.in_dir), out_dir, model, args.mode, only)
+        print('Done. Outputs in:', out_dir)
+    return 0
+
+
+def _snapshot(args: argparse.Namespace) -> int:
+    import time
+
+    from .snapshot import DEFAULT_STORE, ObjectStore, create_snapshot, diff_snapshots, render_section_diff
+
+    store = ObjectStore(Path(args.store) if args.store else DEFAULT_STORE)
+    if args.snapshot_command == 'create':
+        t0 = time.perf_counter()
+        root = create_snapshot(Path(args.source), store, args.name)
+        s = store.stats
+        print(root)
+        print(f"{s.documents} documents ({s.documents_from_cache} unchanged), {s.sections} sections; "
+              f"{s.objects_written} objects written ({s.raw_bytes} -> {s.stored_bytes} bytes), "
+              f"{s.objects_reused} reused; {time.perf_counter() - t0:.3f}s", file=sys.stderr)
+    elif args.snapshot_command == 'list':
+        for ref in store.list_refs():
+            print(f"{ref['name']:<24} {ref['root'][:12]}  {ref['created']}  "
+                  f"{ref['documents']:>5} docs {ref['sections']:>7} sections  {ref['source']}")
+    else:
+        try:
+            old, new = store.resolve(args.old), store.resolve(args.new)
+        except KeyError as e:
+            print(f"error: {e.args[0]}", file=sys.stderr)
+            return 2
+        t0 = time.perf_counter()
+        result = diff_snapshots(store, old, new)
+        elapsed = time.perf_counter() - t0
+        if args.json:
+            json.dump([asdict(c) for c in result.changes], sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            for c in result.changes:
+                print(f"{c.kind:<8} {c.path} :: {c.section}")
+                if args.show:
+                    sys.stdout.write(render_section_diff(store, c))
+        print(f"{len(result.changes)} section changes; {result.nodes_visited} nodes visited in {elapsed:.3f}s",
+              file=sys.stderr)
+        return 1 if result.changes else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
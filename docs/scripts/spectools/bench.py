@@ -0,0 +1,69 @@
+"""Startup-time benchmark: one-shot CLI invocations vs. a warm daemon.
+
+Measures, as median wall time over `--runs` iterations:
+- `python -c pass`             bare interpreter startup (floor)
+- `python -c "import spectools"` package import cost on top of the floor
+- `python -m spectools parse`  full one-shot call (startup + import + parse)
+- daemon `parse` round trip    same request against a warm Unix-socket daemon
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from .daemon import Dispatcher, call, make_socket_server
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def _median_ms(fn: Callable[[], None], runs: int) -> float:
+    samples: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _subprocess(args: List[str]) -> Callable[[], None]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SCRIPTS_DIR), os.environ.get('PYTHONPATH')])))
+
+    def run() -> None:
+        subprocess.run([sys.executable, *args], check=True, env=env, stdout=subprocess.DEVNULL)
+    return run
+
+
+def run_benchmark(task_list: Path, runs: int = 10) -> Dict[str, float]:
+    results = {
+        'interpreter_startup_ms': _median_ms(_subprocess(['-c', 'pass']), runs),
+        'import_spectools_ms': _median_ms(_subprocess(['-c', 'import spectools']), runs),
+        'oneshot_parse_ms': _median_ms(_subprocess(['-m', 'spectools', 'parse', '--task-list', str(task_list)]), runs),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sock = Path(tmp) / 'spectools.sock'
+        server = make_socket_server(Dispatcher(task_list), sock)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            call(sock, 'parse')  # warm the model cache
+            results['daemon_parse_ms'] = _median_ms(lambda: call(sock, 'parse'), runs)
+        finally:
+            server.shutdown()
+            server.server_close()
+    return results
+
+
+def format_results(results: Dict[str, float]) -> str:
+    lines = [f"{name:<26} {value:8.2f}" for name, value in results.items()]
+    speedup = results['oneshot_parse_ms'] / max(results['daemon_parse_ms'], 1e-6)
+    lines.append(f"{'daemon speedup':<26} {speedup:7.1f}x")
+    return "\n".join(lines)
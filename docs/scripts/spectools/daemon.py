@@ -0,0 +1,256 @@
+"""Persistent JSON-RPC 2.0 server for the spec tooling.
+
+Keeps parsed task lists warm (`TaskModelCache`) so editor hooks and CI can
+issue many generate/parse requests without paying interpreter startup, import
+and `task-list.md` parsing on every call.
+
+Transport is newline-delimited JSON: one request object per line, one response
+per line. It is served either over stdin/stdout or over a Unix socket (one
+connection may carry any number of requests).
+
+Methods (all paths are resolved by the server):
+  ping                                         -> {pid, uptime_s, parses}
+  parse          {task_list?}                  -> {tasks: [...]}
+  render_stub    {task, sub?, task_list?}      -> {filename, content}
+  generate_stubs {out_dir, wave?, task_list?}  -> {written: [...]}
+  refine_doc     {text, kind, task_list?}      -> {text}      (kind: task|epic)
+  refine         {in_dir, out_dir, mode?, wave?, task_list?} -> {written: [...]}
+  schedule       {task_list?}                  -> {waves, critical_path, ...}
+  shutdown                                     -> true
+
+`render_stub`, `generate_stubs`, `refine` and `schedule` also take `specs` (directories of
+existing specs whose `**Dependencies:**` headers feed the dependency graph,
+default `docs/tasks/refined-tasks`) and `allow_cycles`; `wave` is 1-based.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, IO, Optional
+
+from .schedule import DependencyGraph, GraphCache, task_id
+from .tasklist import DEFAULT_TASK_LIST, TaskModel, TaskModelCache
+
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Dispatcher:
+    """Maps JSON-RPC method names to handlers backed by a shared model cache."""
+
+    def __init__(self, default_task_list: Path = DEFAULT_TASK_LIST) -> None:
+        self.default_task_list = Path(default_task_list)
+        self.cache = TaskModelCache()
+        self.graphs = GraphCache()
+        self.started = time.monotonic()
+        self.on_shutdown: Optional[Callable[[], None]] = None
+        self._methods: Dict[str, Callable[[dict], Any]] = {
+            'ping': self.ping,
+            'parse': self.parse,
+            'render_stub': self.render_stub,
+            'generate_stubs': self.generate_stubs,
+            'refine_doc': self.refine_doc,
+            'refine': self.refine,
+            'schedule': self.schedule,
+            'shutdown': self.shutdown,
+        }
+
+    def _model(self, params: dict) -> TaskModel:
+        return self.cache.get(Path(params.get('task_list') or self.default_task_list))
+
+    def _graph(self, params: dict) -> DependencyGraph:
+        from .schedule import DEFAULT_SPEC_DIR
+
+        specs = params.get('specs', [str(DEFAULT_SPEC_DIR)])
+        return self.graphs.get(self._model(params), [Path(p) for p in specs])
+
+    def _wave(self, params: dict, graph: DependencyGraph) -> Optional[Collection[str]]:
+        from .schedule import CycleError, build_schedule, wave_members
+
+        if params.get('wave') is None:
+            return None
+        try:
+            return wave_members(build_schedule(graph, bool(params.get('allow_cycles'))), params['wave'])
+        except (CycleError, IndexError) as e:
+            raise RpcError(INVALID_PARAMS, str(e)) from None
+
+    @staticmethod
+    def _require(params: dict, name: str) -> Any:
+        if name not in params:
+            raise RpcError(INVALID_PARAMS, f"missing param: {name}")
+        return params[name]
+
+    def ping(self, params: dict) -> dict:
+        return {'pid': os.getpid(), 'uptime_s': round(time.monotonic() - self.started, 3), 'parses': self.cache.parses}
+
+    def parse(self, params: dict) -> dict:
+        return {'tasks': [asdict(t) for t in self._model(params).tasks]}
+
+    def render_stub(self, params: dict) -> dict:
+        from .stubs import render_stub
+
+        num = self._require(params, 'task')
+        task = next((t for t in self._model(params).tasks if t.number == num), None)
+        if task is None:
+            raise RpcError(INVALID_PARAMS, f"unknown task: {num}")
+        sub = params.get('sub')
+        if sub is not None and not 0 <= sub < len(task.subtasks):
+            raise RpcError(INVALID_PARAMS, f"task {num} has no subtask index {sub}")
+        filename, content = render_stub(task, sub, self._graph(params).dependencies_of(
+            task_id(num, None if sub is None else chr(ord('a') + sub))))
+        return {'filename': filename, 'content': content}
+
+    def generate_stubs(self, params: dict) -> dict:
+        from .stubs import generate_stubs
+
+        out_dir = Path(self._require(params, 'out_dir'))
+        graph = self._graph(params)
+        written = generate_stubs(self._model(params).tasks, out_dir, graph, self._wave(params, graph))
+        return {'written': [str(p) for p in written]}
+
+    def refine_doc(self, params: dict) -> dict:
+        from .refine import refine_epic_doc, refine_task_doc
+
+        text = self._require(params, 'text')
+        kind = params.get('kind', 'task')
+        if kind not in ('task', 'epic'):
+            raise RpcError(INVALID_PARAMS, f"kind must be 'task' or 'epic', got {kind!r}")
+        transform = refine_task_doc if kind == 'task' else refine_epic_doc
+        return {'text': transform(text, self._model(params))}
+
+    def refine(self, params: dict) -> dict:
+        from .refine import refine_tree
+
+        mode = params.get('mode', 'all')
+        if mode not in ('tasks', 'epics', 'all'):
+            raise RpcError(INVALID_PARAMS, f"mode must be tasks, epics or all, got {mode!r}")
+        only = self._wave(params, self._graph(params)) if params.get('wave') is not None else None
+        written = refine_tree(Path(self._require(params, 'in_dir')), Path(self._require(params, 'out_dir')),
+                              self._model(params), mode, only)
+        return {'written': [str(p) for p in written]}
+
+    def schedule(self, params: dict) -> dict:
+        from .schedule import CycleError, build_schedule, schedule_to_dict
+
+        graph = self._graph(params)
+        try:
+            return schedule_to_dict(build_schedule(graph, bool(params.get('allow_cycles'))), graph)
+        except CycleError as e:
+            raise RpcError(SERVER_ERROR, str(e)) from None
+
+    def shutdown(self, params: dict) -> bool:
+        if self.on_shutdown is not None:
+            self.on_shutdown()
+        return True
+
+    def handle(self, request: Any) -> Optional[dict]:
+        """Handle one decoded request; returns None for notifications."""
+        req_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or not isinstance(request.get('method'), str):
+                raise RpcError(INVALID_REQUEST, "invalid request")
+            method = self._methods.get(request['method'])
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"method not found: {request['method']}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            result = method(params)
+        except RpcError as e:
+            return {'jsonrpc': '2.0', 'id': req_id, 'error': {'code': e.code, 'message': e.message}}
+        except Exception as e:  # report handler failures to the client, keep serving
+            return {'jsonrpc': '2.0', 'id': req_id, 'error': {'code': SERVER_ERROR, 'message': f"{type(e).__name__}: {e}"}}
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': req_id, 'result': result}
+
+    def handle_line(self, line: str) -> Optional[str]:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps({'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': str(e)}})
+        response = self.handle(request)
+        return None if response is None else json.dumps(response)
+
+
+def serve_stdio(dispatcher: Dispatcher, stdin: IO[str], stdout: IO[str]) -> None:
+    stopped = threading.Event()
+    dispatcher.on_shutdown = stopped.set
+    for line in stdin:
+        if not line.strip():
+            continue
+        out = dispatcher.handle_line(line)
+        if out is not None:
+            stdout.write(out + "\n")
+            stdout.flush()
+        if stopped.is_set():
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for raw in self.rfile:
+            line = raw.decode('utf-8')
+            if not line.strip():
+                continue
+            out = self.server.dispatcher.handle_line(line)
+            if out is not None:
+                self.wfile.write(out.encode('utf-8') + b"\n")
+                self.wfile.flush()
+
+
+def make_socket_server(dispatcher: Dispatcher, socket_path: Path) -> socketserver.BaseServer:
+    # UnixStreamServer only exists where the platform has AF_UNIX (not CPython on
+    # Windows), so the server class is built here rather than at import time.
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()
+    server = _Server(str(socket_path), _Handler)
+    server.dispatcher = dispatcher
+    # shutdown() blocks until serve_forever() returns, so it must run off the handler thread.
+    dispatcher.on_shutdown = lambda: threading.Thread(target=server.shutdown, daemon=True).start()
+    return server
+
+
+def serve_socket(dispatcher: Dispatcher, socket_path: Path) -> None:
+    server = make_socket_server(dispatcher, socket_path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        Path(socket_path).unlink(missing_ok=True)
+
+
+def call(socket_path: Path, method: str, params: Optional[dict] = None, timeout: float = 30.0) -> Any:
+    """One-shot client: send a request to a running daemon and return its result."""
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline())
+    if 'error' in response:
+        raise RpcError(response['error']['code'], response['error']['message'])
+    return response['result']
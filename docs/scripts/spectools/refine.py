@@ -0,0 +1,190 @@
+"""Prepare refinement-ready documents from stubs (see `generate-refinable-tasks-acode-v2.py`).
+
+Prepends the instruction header and injects canonical context from
+`task-list.md`. It does NOT actually refine/expand the stub (that's done by an LLM).
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from .schedule import task_id
+from .tasklist import TaskModel
+
+
+@lru_cache(maxsize=None)
+def _regexes() -> Dict[str, re.Pattern]:
+    return {
+        'task_header': re.compile(r"^#\s*Task\s+(\d{3})(?:\.([a-z]))?:\s*(.+?)\s*$", re.MULTILINE),
+        'epic_header': re.compile(r"^#\s*(EPIC\s+\d+)\s+—\s+(.+?)\s*$", re.MULTILINE),
+        'doc_start': re.compile(r"^#\s*(Task\s+\d{3}|EPIC\s+\d+)\b", re.MULTILINE),
+        'spaces': re.compile(r'\s+'),
+    }
+
+
+def iter_md_files(folder: Path) -> Iterable[Path]:
+    for p in folder.rglob('*.md'):
+        if p.is_file():
+            yield p
+
+
+def normalize_filename(name: str) -> str:
+    name = name.replace('(NEEDS-REFINEMENT)', '').strip()
+    name = _regexes()['spaces'].sub(' ', name)
+    return name
+
+
+def already_has_instructions(text: str) -> bool:
+    return text.lstrip().startswith('# INSTRUCTIONS FOR CLAUDE')
+
+
+def parse_task_header(md: str) -> Optional[Tuple[int, Optional[str], str]]:
+    m = _regexes()['task_header'].search(md)
+    if not m:
+        return None
+    return int(m.group(1)), m.group(2), m.group(3).strip()
+
+
+def parse_epic_header(md: str) -> Optional[Tuple[str, str]]:
+    m = _regexes()['epic_header'].search(md)
+    if not m:
+        return None
+    return m.group(1).strip(), m.group(2).strip()
+
+
+def _insert_after_header(md: str, context: str) -> str:
+    marker = "\n---\n\n"
+    idx = md.find(marker)
+    if idx != -1:
+        insert_at = idx + len(marker)
+        return md[:insert_at] + context + md[insert_at:]
+    return context + md
+
+
+def inject_task_context(md: str, task_num: int, suffix: Optional[str], task_map) -> str:
+    info = task_map.get(task_num)
+    if not info:
+        return md
+    canonical_title = info['title']
+    if suffix is not None:
+        idx = ord(suffix) - ord('a')
+        if 0 <= idx < len(info['subs']):
+            canonical_title = info['subs'][idx]
+
+    subtasks = info['subs']
+    epic_code = info['epic_code']
+    epic_title = info['epic_title']
+
+    siblings = "\n".join([f"  - Task {task_num:03d}.{chr(97+i)}: {t}" for i,t in enumerate(subtasks)]) if subtasks else "  - (none)"
+
+    context = f"""## Canonical Context (from task-list.md)
+
+- **Epic:** {epic_code} — {epic_title}
+- **Canonical Task Title:** Task {task_num:03d}{('.'+suffix) if suffix else ''}: {canonical_title}
+- **Sibling Subtasks (if applicable):**
+{siblings}
+
+- **Hard constraints reminder:** MUST comply with Task 001 operating modes and the “no external LLM API” constraint set.
+- **Repo contract reminder:** MUST align with Task 002 `.agent/config.yml` contract where relevant.
+
+---
+
+"""
+    return _insert_after_header(md, context)
+
+
+def inject_epic_context(md: str, epic_code: str, epic_map) -> str:
+    e = epic_map.get(epic_code)
+    if not e:
+        return md
+    tasks = e['tasks']
+    lines = []
+    for num,title,subs in tasks:
+        lines.append(f"- Task {num:03d}: {title}")
+        for i,sub in enumerate(subs):
+            lines.append(f"  - Task {num:03d}.{chr(97+i)}: {sub}")
+    task_list_lines = "\n".join(lines)
+
+    context = f"""## Canonical Context (from task-list.md)
+
+- **Epic:** {epic_code} — {e['title']}
+- **Tasks in this epic:**
+{task_list_lines}
+
+---
+
+"""
+    return _insert_after_header(md, context)
+
+
+def ensure_header(md: str, header: str) -> str:
+    if already_has_instructions(md):
+        # Replace existing instructions block with the stronger header by stripping leading instructions section.
+        # Strategy: If file starts with '# INSTRUCTIONS FOR CLAUDE', remove everything until the first '# Task' or '# EPIC'
+        stripped = md.lstrip()
+        if stripped.startswith('# INSTRUCTIONS FOR CLAUDE'):
+            m = _regexes()['doc_start'].search(stripped)
+            if m:
+                md = stripped[m.start():]
+            else:
+                md = stripped
+    return header + md
+
+
+def refine_task_doc(md: str, model: TaskModel) -> str:
+    from .templates import TASK_HEADER
+
+    th = parse_task_header(md)
+    md2 = ensure_header(md, TASK_HEADER)
+    if th:
+        num, suffix, _ = th
+        md2 = inject_task_context(md2, num, suffix, model.task_map)
+    return md2
+
+
+def refine_epic_doc(md: str, model: TaskModel) -> str:
+    from .templates import EPIC_HEADER
+
+    eh = parse_epic_header(md)
+    md2 = ensure_header(md, EPIC_HEADER)
+    if eh:
+        code, _ = eh
+        md2 = inject_epic_context(md2, code, model.epic_map)
+    return md2
+
+
+def refine_tree(in_dir: Path, out_dir: Path, model: TaskModel, mode: str = 'all',
+                only: Optional[Collection[str]] = None) -> List[Path]:
+    """Process `in_dir/tasks` and/or `in_dir/epics` into `out_dir/refined-*`; returns written paths.
+
+    `only` restricts task documents to those task ids (e.g. one wave from
+    `spectools.schedule`); epic documents are skipped when it is given.
+    """
+    in_dir = Path(in_dir).resolve()
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+
+    jobs = []
+    if mode in ('tasks', 'all'):
+        jobs.append(('tasks', 'refined-tasks', refine_task_doc))
+    if mode in ('epics', 'all') and only is None:
+        jobs.append(('epics', 'refined-epics', refine_epic_doc))
+
+    for src_name, dst_name, transform in jobs:
+        src = in_dir / src_name if (in_dir / src_name).exists() else in_dir
+        dst = out_dir / dst_name
+        dst.mkdir(parents=True, exist_ok=True)
+        for f in iter_md_files(src):
+            md = f.read_text(encoding='utf-8')
+            if only is not None:
+                th = parse_task_header(md)
+                if th is None or task_id(th[0], th[1]) not in only:
+                    continue
+            target = dst / normalize_filename(f.name)
+            target.write_text(transform(md, model), encoding='utf-8')
+            written.append(target)
+    return written
@@ -0,0 +1,362 @@
+"""Task dependency DAG and refinement waves.
+
+Nodes are every task and subtask in `task-list.md`, keyed `"010"` /
+`"010.a"`. Edges come from two places:
+
+- each subtask depends on its parent task (the task list is the only
+  structure `task-list.md` carries), and
+- the `**Dependencies:**` header of existing specs (`Task 040 (Event Log),
+  Task 040.a` ...); `TBD`/`None` and epic references add no edges.
+
+`topological_waves` groups the DAG into waves whose members have no
+dependencies on each other, so every task in a wave can be generated or
+refined in parallel once the previous waves are done. `critical_path` is the
+longest dependency chain weighted by complexity points (the spec's
+`**Complexity:**` header, or the stub default), i.e. the lower bound on
+serial refinement effort however many workers run.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .tasklist import TaskModel
+from .textio import read_markdown
+
+DEFAULT_SPEC_DIR = Path(__file__).resolve().parent.parent.parent / "tasks" / "refined-tasks"
+
+
+@lru_cache(maxsize=None)
+def _regexes() -> Dict[str, re.Pattern]:
+    return {
+        'task_header': re.compile(r"^#\s*Task\s+(\d{3})(?:\.([a-z]))?:", re.MULTILINE),
+        'dependencies': re.compile(r"^\*\*Dependencies:\*\*(.*)$", re.MULTILINE),
+        'complexity': re.compile(r"^\*\*Complexity:\*\*\s*(\d+)", re.MULTILINE),
+        'task_ref': re.compile(r"\bTask\s+(\d{3})(?:\.([a-z]))?\b"),
+    }
+
+
+def task_id(number: int, suffix: Optional[str] = None) -> str:
+    """`task_id(40, 'a') == '040.a'`"""
+    return f"{number:03d}.{suffix}" if suffix else f"{number:03d}"
+
+
+def parse_dependencies(value: str) -> List[str]:
+    """Task ids referenced in a `**Dependencies:**` value, in order, deduplicated."""
+    seen: List[str] = []
+    for m in _regexes()['task_ref'].finditer(value):
+        tid = task_id(int(m.group(1)), m.group(2))
+        if tid not in seen:
+            seen.append(tid)
+    return seen
+
+
+def read_spec_header(md: str) -> Optional[Tuple[str, List[str], Optional[int]]]:
+    """`(task_id, dependencies, complexity)` from a spec's header, or None if it is not a task spec.
+
+    Only the header fields following the `# Task NNN:` heading are read, so
+    instruction blocks prepended by `refine` are skipped.
+    """
+    rx = _regexes()
+    m = rx['task_header'].search(md)
+    if not m:
+        return None
+    header = md[m.end():]
+    end = header.find("\n---")
+    if end != -1:
+        header = header[:end]
+    dm = rx['dependencies'].search(header)
+    cm = rx['complexity'].search(header)
+    return (task_id(int(m.group(1)), m.group(2)),
+            parse_dependencies(dm.group(1)) if dm else [],
+            int(cm.group(1)) if cm else None)
+
+
+@dataclass
+class DependencyGraph:
+    titles: Dict[str, str]  # task-list order
+    deps: Dict[str, Set[str]]
+    points: Dict[str, int]
+    declared_in: Dict[str, List[Path]] = field(default_factory=dict)
+    unknown: Dict[str, List[str]] = field(default_factory=dict)  # id -> referenced ids missing from the task list
+    _rank: Optional[Dict[str, int]] = field(default=None, repr=False)
+
+    def order(self, ids: Iterable[str]) -> List[str]:
+        """`ids` sorted into task-list order."""
+        if self._rank is None:
+            self._rank = {tid: i for i, tid in enumerate(self.titles)}
+        return sorted(ids, key=self._rank.__getitem__)
+
+    def dependencies_of(self, tid: str) -> List[str]:
+        return self.order(self.deps.get(tid, ()))
+
+
+class CycleError(ValueError):
+    """Raised when the dependency graph has cycles; `cycles` holds one member list per cycle."""
+
+    def __init__(self, graph: DependencyGraph, cycles: List[List[str]]) -> None:
+        super().__init__("; ".join(describe_cycle(graph, c) for c in cycles))
+        self.cycles = cycles
+
+
+def build_graph(model: TaskModel, spec_dirs: Sequence[Path] = ()) -> DependencyGraph:
+    """Build the graph from the task list plus the headers of `*.md` specs under `spec_dirs`."""
+    from .refine import iter_md_files
+    from .stubs import default_meta
+
+    titles: Dict[str, str] = {}
+    deps: Dict[str, Set[str]] = {}
+    points: Dict[str, int] = {}
+    for t in model.tasks:
+        tid = task_id(t.number)
+        titles[tid] = t.title
+        deps[tid] = set()
+        points[tid] = default_meta(t.number, False)[1]
+        for i, sub in enumerate(t.subtasks):
+            sid = task_id(t.number, chr(ord('a') + i))
+            titles[sid] = sub
+            deps[sid] = {tid}
+            points[sid] = default_meta(t.number, True)[1]
+
+    graph = DependencyGraph(titles, deps, points)
+    for spec_dir in spec_dirs:
+        for path in sorted(iter_md_files(Path(spec_dir))):
+            header = read_spec_header(read_markdown(path))
+            if header is None or header[0] not in titles:
+                continue
+            tid, refs, complexity = header
+            graph.declared_in.setdefault(tid, []).append(path)
+            if complexity is not None:
+                points[tid] = complexity
+            for ref in refs:
+                if ref in titles:
+                    deps[tid].add(ref)
+                elif ref not in graph.unknown.get(tid, ()):
+                    graph.unknown.setdefault(tid, []).append(ref)
+    return graph
+
+
+class GraphCache:
+    """Thread-safe cache of dependency graphs for the daemon.
+
+    An entry is reused while the task model is the same object (see
+    `TaskModelCache`) and no spec under `spec_dirs` was added, removed or
+    modified; checking that costs a directory walk instead of a re-parse.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, ...], Tuple[TaskModel, tuple, DependencyGraph]] = {}
+        self.builds = 0
+
+    @staticmethod
+    def _signature(spec_dirs: Sequence[Path]) -> tuple:
+        sig = []
+        for spec_dir in spec_dirs:
+            for p in Path(spec_dir).rglob('*.md'):
+                st = p.stat()
+                sig.append((str(p), st.st_size, st.st_mtime_ns))
+        return tuple(sorted(sig))
+
+    def get(self, model: TaskModel, spec_dirs: Sequence[Path]) -> DependencyGraph:
+        key = tuple(str(Path(d).resolve()) for d in spec_dirs)
+        sig = self._signature(spec_dirs)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit and hit[0] is model and hit[1] == sig:
+                return hit[2]
+            graph = build_graph(model, spec_dirs)
+            self._entries[key] = (model, sig, graph)
+            self.builds += 1
+            return graph
+
+
+def _components(graph: DependencyGraph) -> List[List[str]]:
+    """Strongly connected components (iterative Tarjan), dependencies before dependents."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    for root in graph.titles:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.dependencies_of(root)))]
+        while work:
+            node, succ = work[-1]
+            for nxt in succ:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = len(index)
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(graph.dependencies_of(nxt))))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(graph.order(component))
+    return components
+
+
+def find_cycles(graph: DependencyGraph) -> List[List[str]]:
+    """Groups of tasks that (transitively) depend on each other, including self-dependencies."""
+    cycles = [c for c in _components(graph) if _is_cycle(graph, c)]
+    first = graph.order(c[0] for c in cycles)
+    return sorted(cycles, key=lambda c: first.index(c[0]))
+
+
+def _is_cycle(graph: DependencyGraph, component: List[str]) -> bool:
+    return len(component) > 1 or component[0] in graph.deps[component[0]]
+
+
+def _condense(graph: DependencyGraph, allow_cycles: bool) -> Tuple[List[List[str]], List[Set[int]]]:
+    """Components (dependencies first) and, per component, the components it depends on."""
+    components = _components(graph)
+    if not allow_cycles:
+        cycles = [c for c in components if _is_cycle(graph, c)]
+        if cycles:
+            raise CycleError(graph, cycles)
+    comp_of = {tid: i for i, c in enumerate(components) for tid in c}
+    upstream = [{comp_of[d] for tid in c for d in graph.deps[tid]} - {i} for i, c in enumerate(components)]
+    return components, upstream
+
+
+def describe_cycle(graph: DependencyGraph, members: List[str]) -> str:
+    """`members` plus one concrete loop through the first of them, e.g. `... (039 -> 049.e -> 039)`."""
+    start = members[0]
+    inside = set(members)
+    came_from: Dict[str, str] = {}
+    frontier = [start]
+    while frontier and start not in came_from:
+        nxt_frontier = []
+        for node in frontier:
+            for dep in graph.dependencies_of(node):
+                if dep in inside and dep not in came_from:
+                    came_from[dep] = node
+                    nxt_frontier.append(dep)
+        frontier = nxt_frontier
+    loop = [start]
+    node = came_from[start]
+    while node != start:
+        loop.append(node)
+        node = came_from[node]
+    loop.append(start)
+    return (f"dependency cycle among {', '.join('Task ' + m for m in members)} "
+            f"({' -> '.join(reversed(loop))})")
+
+
+def topological_waves(graph: DependencyGraph, allow_cycles: bool = False) -> List[List[str]]:
+    """Group tasks into waves: wave N depends only on waves < N.
+
+    Raises `CycleError` if the graph has cycles, unless `allow_cycles`, in
+    which case each cycle is kept together in one wave (its members have to be
+    refined side by side anyway).
+    """
+    components, upstream = _condense(graph, allow_cycles)
+
+    # Tarjan emits components dependencies-first, so one pass assigns levels.
+    level: List[int] = []
+    for i in range(len(components)):
+        level.append(1 + max((level[u] for u in upstream[i]), default=-1))
+
+    waves: List[List[str]] = [[] for _ in range(max(level, default=-1) + 1)]
+    for i, comp in enumerate(components):
+        waves[level[i]].extend(comp)
+    return [graph.order(w) for w in waves]
+
+
+def critical_path(graph: DependencyGraph, allow_cycles: bool = False) -> Tuple[List[str], int]:
+    """Longest dependency chain by complexity points: `(task ids in order, total points)`.
+
+    With `allow_cycles`, a cycle on the path counts as all of its members.
+    """
+    components, upstream = _condense(graph, allow_cycles)
+
+    best: List[int] = []
+    via: List[Optional[int]] = []
+    for i, comp in enumerate(components):
+        prev = max(sorted(upstream[i]), key=best.__getitem__, default=None)
+        best.append(sum(graph.points[t] for t in comp) + (best[prev] if prev is not None else 0))
+        via.append(prev)
+    if not components:
+        return [], 0
+
+    node: Optional[int] = max(range(len(components)), key=best.__getitem__)
+    total = best[node]
+    chain: List[int] = []
+    while node is not None:
+        chain.append(node)
+        node = via[node]
+    return [tid for i in reversed(chain) for tid in components[i]], total
+
+
+@dataclass
+class Schedule:
+    waves: List[List[str]]
+    critical_path: List[str]
+    critical_points: int
+    total_points: int
+    cycles: List[List[str]] = field(default_factory=list)
+
+
+def build_schedule(graph: DependencyGraph, allow_cycles: bool = False) -> Schedule:
+    waves = topological_waves(graph, allow_cycles)
+    path, points = critical_path(graph, allow_cycles)
+    return Schedule(waves, path, points, sum(graph.points.values()), find_cycles(graph) if allow_cycles else [])
+
+
+def wave_members(schedule: Schedule, wave: int) -> Set[str]:
+    """Task ids in 1-based `wave`; raises `IndexError` if there is no such wave."""
+    if not 1 <= wave <= len(schedule.waves):
+        raise IndexError(f"wave {wave} out of range (1..{len(schedule.waves)})")
+    return set(schedule.waves[wave - 1])
+
+
+def schedule_to_dict(schedule: Schedule, graph: DependencyGraph) -> dict:
+    return {
+        'waves': schedule.waves,
+        'critical_path': schedule.critical_path,
+        'critical_points': schedule.critical_points,
+        'total_points': schedule.total_points,
+        'cycles': schedule.cycles,
+        'dependencies': {tid: graph.dependencies_of(tid) for tid in graph.titles},
+        'unknown': graph.unknown,
+    }
+
+
+def format_schedule(schedule: Schedule, graph: DependencyGraph) -> str:
+    lines = []
+    for n, wave in enumerate(schedule.waves, 1):
+        lines.append(f"Wave {n}: {len(wave)} tasks, {sum(graph.points[t] for t in wave)} points")
+        lines.append("  " + " ".join(wave))
+    lines.append("")
+    lines.append(f"Critical path: {schedule.critical_points} of {schedule.total_points} points, "
+                 f"{len(schedule.critical_path)} tasks")
+    for tid in schedule.critical_path:
+        lines.append(f"  Task {tid} ({graph.points[tid]}): {graph.titles[tid]}")
+    for members in schedule.cycles:
+        lines.append(f"warning: {describe_cycle(graph, members)}; kept in one wave")
+    for tid, refs in graph.unknown.items():
+        lines.append(f"warning: Task {tid} depends on {', '.join('Task ' + r for r in refs)}, not in the task list")
+    return "\n".join(lines)
@@ -0,0 +1,335 @@
+"""Merkle section-hash snapshots of the spec corpus.
+
+A snapshot hashes every markdown document section by section (split on ATX
+headings outside fenced code) into a Merkle tree:
+
+    tree  -> sorted entries (name, kind, hash)       kind: tree | doc
+    doc   -> ordered sections (key, blob hash)       key: heading path, e.g. "Task 001 > Description"
+    blob  -> raw section text
+
+Every node is stored once in a content-addressed, zlib-compressed object
+store (one SQLite file keyed by SHA-256), so unchanged sections, documents and folders
+are shared between snapshots. Diffing two snapshots walks only subtrees
+whose hashes differ, so the cost is proportional to the change, not the
+corpus size.
+
+Sources may be a directory (e.g. `docs/tasks`) or a `.zip` archive (e.g.
+`ecommerce task samples.zip`). A stat cache (size/mtime, or size/CRC for zip
+members) lets re-snapshots skip re-reading unchanged files.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .textio import decode_markdown
+
+DEFAULT_STORE = Path(__file__).resolve().parent.parent.parent / ".spec-snapshots"
+PREAMBLE = "(preamble)"
+# Bumped when the way a file maps to sections changes, so stat-cache hits from older code are not reused.
+STAT_CACHE_VERSION = 2
+
+
+@dataclass
+class SnapshotStats:
+    documents: int = 0
+    sections: int = 0
+    documents_from_cache: int = 0
+    objects_written: int = 0
+    objects_reused: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+
+@dataclass
+class Change:
+    kind: str          # added | removed | changed
+    path: str          # document path within the snapshot
+    section: str       # section key
+    old: Optional[str] = None  # blob hashes
+    new: Optional[str] = None
+
+
+@dataclass
+class DiffResult:
+    changes: List[Change] = field(default_factory=list)
+    nodes_visited: int = 0
+
+
+@lru_cache(maxsize=None)
+def _heading_parts() -> Tuple[re.Pattern, re.Pattern]:
+    return re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$"), re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split markdown into `(heading path key, section text)` pairs.
+
+    Keys join the enclosing heading texts with " > "; repeated keys get a
+    " [n]" suffix so every key in a document is unique.
+    """
+    atx_re, fence_re = _heading_parts()
+    sections: List[Tuple[str, List[str]]] = [(PREAMBLE, [])]
+    stack: List[Tuple[int, str]] = []
+    fence: Optional[str] = None
+    for line in text.splitlines(keepends=True):
+        head = line.lstrip()[:1]
+        if head in ("`", "~"):
+            fm = fence_re.match(line)
+            if fm:
+                marker = fm.group(1)
+                if fence is None:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence):
+                    fence = None
+        elif head == "#" and fence is None:
+            hm = atx_re.match(line)
+            if hm:
+                level = len(hm.group(1))
+                while stack and stack[-1][0] >= level:
+                    stack.pop()
+                stack.append((level, hm.group(2)))
+                sections.append((" > ".join(t for _, t in stack), [line]))
+                continue
+        sections[-1][1].append(line)
+
+    out: List[Tuple[str, str]] = []
+    seen: Dict[str, int] = {}
+    for key, lines in sections:
+        if key == PREAMBLE and not lines:
+            continue
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        out.append((key if n == 0 else f"{key} [{n + 1}]", "".join(lines)))
+    return out
+
+
+class ObjectStore:
+    """Content-addressed store of zlib-compressed objects, snapshot refs and the stat cache.
+
+    Backed by a single SQLite file (`store.sqlite`): tens of thousands of small
+    section blobs as loose files would cost a filesystem block each.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS objects (digest TEXT PRIMARY KEY, data BLOB NOT NULL);
+        CREATE TABLE IF NOT EXISTS refs (name TEXT PRIMARY KEY, root TEXT NOT NULL, source TEXT NOT NULL,
+                                         created TEXT NOT NULL, documents INTEGER, sections INTEGER);
+        CREATE TABLE IF NOT EXISTS stat_cache (key TEXT PRIMARY KEY, a INTEGER, b INTEGER,
+                                               digest TEXT NOT NULL, sections INTEGER) WITHOUT ROWID;
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.root / "store.sqlite"))
+        self.db.executescript(self.SCHEMA)
+        self.stats = SnapshotStats()
+        self._node_cache: Dict[str, object] = {}
+
+    def close(self) -> None:
+        self.db.close()
+
+    def put(self, kind: str, data: bytes) -> str:
+        raw = kind.encode() + b"\0" + data
+        digest = hashlib.sha256(raw).hexdigest()
+        if self.has(digest):
+            self.stats.objects_reused += 1
+            return digest
+        packed = zlib.compress(raw, 6)
+        self.db.execute("INSERT INTO objects (digest, data) VALUES (?, ?)", (digest, packed))
+        self.stats.objects_written += 1
+        self.stats.raw_bytes += len(raw)
+        self.stats.stored_bytes += len(packed)
+        return digest
+
+    def has(self, digest: str) -> bool:
+        return self.db.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def get(self, digest: str) -> Tuple[str, bytes]:
+        row = self.db.execute("SELECT data FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"missing object: {digest}")
+        kind, _, data = zlib.decompress(row[0]).partition(b"\0")
+        return kind.decode(), data
+
+    def put_node(self, kind: str, node) -> str:
+        return self.put(kind, json.dumps(node, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+    def get_node(self, digest: str):
+        if digest not in self._node_cache:
+            _, data = self.get(digest)
+            self._node_cache[digest] = json.loads(data)
+        return self._node_cache[digest]
+
+    def get_text(self, digest: str) -> str:
+        return self.get(digest)[1].decode("utf-8")
+
+    def save_ref(self, name: str, root: str, source: str, stats: SnapshotStats) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO refs (name, root, source, created, documents, sections) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, root, source, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), stats.documents, stats.sections),
+        )
+
+    def resolve(self, name_or_hash: str) -> str:
+        row = self.db.execute("SELECT root FROM refs WHERE name = ?", (name_or_hash,)).fetchone()
+        if row is not None:
+            return row[0]
+        if len(name_or_hash) == 64 and self.has(name_or_hash):
+            return name_or_hash
+        raise KeyError(f"unknown snapshot: {name_or_hash}")
+
+    def list_refs(self) -> List[dict]:
+        cur = self.db.execute("SELECT name, root, source, created, documents, sections FROM refs ORDER BY created, name")
+        cols = [c[0] for c in cur.description]
+        return [dict(zip(cols, row)) for row in cur]
+
+
+# ─── Snapshot creation ───────────────────────────────────────────────────────
+
+
+def _iter_dir(source: Path) -> Iterator[Tuple[str, Tuple, Callable[[], bytes]]]:
+    for p in sorted(source.rglob("*.md")):
+        if p.is_file():
+            st = p.stat()
+            yield p.relative_to(source).as_posix(), (st.st_size, st.st_mtime_ns), p.read_bytes
+
+
+def _iter_zip(zf: zipfile.ZipFile) -> Iterator[Tuple[str, Tuple, Callable[[], bytes]]]:
+    for info in sorted(zf.infolist(), key=lambda i: i.filename):
+        if not info.is_dir() and info.filename.lower().endswith(".md"):
+            yield info.filename, (info.file_size, info.CRC), (lambda i=info: zf.read(i))
+
+
+def _put_document(store: ObjectStore, data: bytes) -> Tuple[str, int]:
+    sections = split_sections(decode_markdown(data))
+    node = [[key, store.put("blob", text.encode("utf-8"))] for key, text in sections]
+    return store.put_node("doc", node), len(node)
+
+
+def _build_tree(store: ObjectStore, docs: Dict[str, str]) -> str:
+    """Write tree nodes bottom-up for `{posix path: doc hash}`; returns the root hash."""
+    children: Dict[str, Dict[str, Tuple[str, str]]] = {"": {}}
+    for path, digest in docs.items():
+        parts = path.split("/")
+        for i in range(len(parts) - 1):
+            children.setdefault("/".join(parts[:i + 1]), {})
+        parent = "/".join(parts[:-1])
+        children[parent][parts[-1]] = ("doc", digest)
+
+    # Deepest directories first so each parent sees its children's final hashes.
+    for d in sorted(children, key=lambda p: p.count("/") + (1 if p else 0), reverse=True):
+        node = [[name, kind, digest] for name, (kind, digest) in sorted(children[d].items())]
+        digest = store.put_node("tree", node)
+        if d:
+            parent, _, name = d.rpartition("/")
+            children[parent][name] = ("tree", digest)
+        else:
+            return digest
+    raise AssertionError("unreachable")
+
+
+def create_snapshot(source: Path, store: ObjectStore, name: Optional[str] = None) -> str:
+    """Snapshot a directory or zip archive into `store`; returns the root hash.
+
+    `store.stats` is reset per call, so it (and the saved ref) describes this snapshot only.
+    """
+    source = Path(source).resolve()
+    docs: Dict[str, str] = {}
+    stats = store.stats = SnapshotStats()
+
+    def add(rel: str, key: Tuple, read: Callable[[], bytes]) -> None:
+        cache_key = f"v{STAT_CACHE_VERSION}:{source}::{rel}"
+        hit = store.db.execute("SELECT a, b, digest, sections FROM stat_cache WHERE key = ?", (cache_key,)).fetchone()
+        if hit and hit[:2] == key and store.has(hit[2]):
+            docs[rel] = hit[2]
+            stats.documents_from_cache += 1
+            stats.sections += hit[3]
+        else:
+            digest, n_sections = _put_document(store, read())
+            docs[rel] = digest
+            store.db.execute("INSERT OR REPLACE INTO stat_cache (key, a, b, digest, sections) VALUES (?, ?, ?, ?, ?)",
+                             (cache_key, *key, digest, n_sections))
+            stats.sections += n_sections
+        stats.documents += 1
+
+    if source.is_dir():
+        for rel, key, read in _iter_dir(source):
+            add(rel, key, read)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zf:
+            for rel, key, read in _iter_zip(zf):
+                add(rel, key, read)
+    else:
+        raise ValueError(f"source must be a directory or .zip archive: {source}")
+
+    root = _build_tree(store, docs)
+    if name:
+        store.save_ref(name, root, str(source), stats)
+    store.db.commit()
+    return root
+
+
+# ─── Diff ────────────────────────────────────────────────────────────────────
+
+
+def _doc_changes(store: ObjectStore, path: str, old: Optional[str], new: Optional[str], out: DiffResult) -> None:
+    old_secs = dict(store.get_node(old)) if old else {}
+    new_secs = dict(store.get_node(new)) if new else {}
+    out.nodes_visited += (1 if old else 0) + (1 if new else 0)
+    for key, digest in new_secs.items():
+        if key not in old_secs:
+            out.changes.append(Change("added", path, key, None, digest))
+        elif old_secs[key] != digest:
+            out.changes.append(Change("changed", path, key, old_secs[key], digest))
+    for key, digest in old_secs.items():
+        if key not in new_secs:
+            out.changes.append(Change("removed", path, key, digest, None))
+
+
+def _walk(store: ObjectStore, prefix: str, old: Optional[Tuple[str, str]], new: Optional[Tuple[str, str]],
+          out: DiffResult) -> None:
+    if old and new and old == new:
+        return
+    old_kind, old_hash = old if old else (None, None)
+    new_kind, new_hash = new if new else (None, None)
+
+    # A path that switched between file and folder is a removal plus an addition.
+    if old_kind and new_kind and old_kind != new_kind:
+        _walk(store, prefix, old, None, out)
+        _walk(store, prefix, None, new, out)
+        return
+
+    if (old_kind or new_kind) == "doc":
+        _doc_changes(store, prefix, old_hash, new_hash, out)
+        return
+
+    old_entries = {n: (k, h) for n, k, h in store.get_node(old_hash)} if old_hash else {}
+    new_entries = {n: (k, h) for n, k, h in store.get_node(new_hash)} if new_hash else {}
+    out.nodes_visited += (1 if old_hash else 0) + (1 if new_hash else 0)
+    for name in sorted(old_entries.keys() | new_entries.keys()):
+        child = f"{prefix}/{name}" if prefix else name
+        _walk(store, child, old_entries.get(name), new_entries.get(name), out)
+
+
+def diff_snapshots(store: ObjectStore, old_root: str, new_root: str) -> DiffResult:
+    out = DiffResult()
+    _walk(store, "", ("tree", old_root), ("tree", new_root), out)
+    return out
+
+
+def render_section_diff(store: ObjectStore, change: Change, context: int = 3) -> str:
+    old = store.get_text(change.old).splitlines(keepends=True) if change.old else []
+    new = store.get_text(change.new).splitlines(keepends=True) if change.new else []
+    label = f"{change.path} :: {change.section}"
+    return "".join(difflib.unified_diff(old, new, f"a/{label}", f"b/{label}", n=context))
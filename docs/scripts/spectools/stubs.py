@@ -0,0 +1,111 @@
+"""Render instruction-prepended task stubs (see `generate-acode-task-stubs.py`).
+
+- Naming: `task-XXX-... (NEEDS-REFINEMENT).md`
+- For subtasks: `task-XXXa-... (NEEDS-REFINEMENT).md`
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Collection, List, Optional, Sequence, Tuple
+
+from .schedule import task_id
+from .tasklist import Task
+
+if TYPE_CHECKING:
+    from .schedule import DependencyGraph
+
+
+@lru_cache(maxsize=None)
+def _slug_regexes() -> Tuple[re.Pattern, re.Pattern]:
+    return re.compile(r"[^a-z0-9\s-]"), re.compile(r"\s+")
+
+
+def slugify(s: str) -> str:
+    strip_re, space_re = _slug_regexes()
+    s = s.lower()
+    s = strip_re.sub("", s)
+    s = space_re.sub("-", s.strip())
+    return s[:80].strip("-") or "task"
+
+
+def default_meta(task_num: int, is_sub: bool, depends_on: Sequence[str] = ()) -> tuple[str, int, str, str]:
+    # Keep this simple: you can customize later.
+    tier = "S"
+    complexity = 5 if is_sub else 8
+    phase = "Phase 1 - Foundation"
+    if depends_on:
+        dependencies = ", ".join(f"Task {tid}" for tid in depends_on)
+    else:
+        dependencies = "TBD" if task_num > 0 else "None"
+    return tier, complexity, phase, dependencies
+
+
+def render_stub(task: Task, sub_idx: Optional[int] = None,
+                depends_on: Optional[Sequence[str]] = None) -> Tuple[str, str]:
+    """Return `(filename, content)` for a task stub or one of its subtasks.
+
+    `depends_on` fills `**Dependencies:**` (task ids such as `"040.a"`);
+    by default a subtask depends on its parent and a task is `TBD`.
+    """
+    from .templates import INSTRUCTIONS, STUB_TEMPLATE
+
+    is_sub = sub_idx is not None
+    suffix = ""
+    title = task.title
+    if is_sub:
+        suffix = chr(ord('a') + sub_idx)
+        title = task.subtasks[sub_idx]
+        suffix = "." + suffix
+
+    if depends_on is None:
+        depends_on = [task_id(task.number)] if is_sub else []
+    tier, complexity, phase, dependencies = default_meta(task.number, is_sub, depends_on)
+    priority = task.number  # simple default
+    stub_description = "Expand this stub into a complete specification following the instructions."
+
+    content = INSTRUCTIONS + STUB_TEMPLATE.format(
+        task_num=task.number,
+        suffix=suffix,
+        title=title,
+        priority=f"{priority}",
+        tier=tier,
+        complexity=complexity,
+        phase=phase,
+        dependencies=dependencies,
+        stub_description=stub_description
+    )
+
+    filename = f"task-{task.number:03d}{suffix.replace('.', '')}-{slugify(title)} (NEEDS-REFINEMENT).md"
+    return filename, content
+
+
+def write_stub(task: Task, out_dir: Path, sub_idx: Optional[int] = None,
+               depends_on: Optional[Sequence[str]] = None) -> Path:
+    filename, content = render_stub(task, sub_idx, depends_on)
+    path = Path(out_dir) / filename
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def generate_stubs(tasks: List[Task], out_dir: Path, graph: Optional["DependencyGraph"] = None,
+                   only: Optional[Collection[str]] = None) -> List[Path]:
+    """Write parent + subtask stubs for every task; returns the written paths.
+
+    With `graph` (`spectools.schedule.build_graph`) the stubs carry the real
+    dependencies; `only` restricts output to those task ids, e.g. one wave.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: List[Path] = []
+    for t in tasks:
+        # Always generate parent + subtasks stubs
+        for sub_idx in [None, *range(len(t.subtasks))]:
+            tid = task_id(t.number, None if sub_idx is None else chr(ord('a') + sub_idx))
+            if only is not None and tid not in only:
+                continue
+            depends_on = graph.dependencies_of(tid) if graph is not None and tid in graph.titles else None
+            written.append(write_stub(t, out_dir, sub_idx, depends_on))
+    return written
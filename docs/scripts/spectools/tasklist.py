@@ -0,0 +1,113 @@
+"""Parse `task-list.md` into a task model.
+
+Regexes are compiled on first use, and `TaskModelCache` keeps parsed models
+keyed by (path, size, mtime) so long-lived callers (the daemon) re-parse the
+task list only when it actually changes.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TASK_LIST = Path(__file__).resolve().parent.parent.parent / "tasks" / "task-list.md"
+
+
+@dataclass
+class Task:
+    number: int
+    title: str
+    subtasks: List[str]
+    epic: str
+    epic_title: str
+
+
+@dataclass
+class TaskModel:
+    tasks: List[Task]
+    _epic_map: Optional[Dict[str, dict]] = field(default=None, repr=False)
+    _task_map: Optional[Dict[int, dict]] = field(default=None, repr=False)
+
+    @property
+    def epic_map(self) -> Dict[str, dict]:
+        """`{epic_code: {'title', 'tasks': [(num, title, subs), ...]}}`"""
+        if self._epic_map is None:
+            epic_map: Dict[str, dict] = {}
+            for t in self.tasks:
+                if t.epic:
+                    e = epic_map.setdefault(t.epic, {'title': t.epic_title, 'tasks': []})
+                    e['tasks'].append((t.number, t.title, t.subtasks))
+            self._epic_map = epic_map
+        return self._epic_map
+
+    @property
+    def task_map(self) -> Dict[int, dict]:
+        """`{task_num: {'title', 'subs', 'epic_code', 'epic_title'}}`"""
+        if self._task_map is None:
+            self._task_map = {
+                t.number: {'title': t.title, 'subs': t.subtasks, 'epic_code': t.epic, 'epic_title': t.epic_title}
+                for t in self.tasks
+            }
+        return self._task_map
+
+
+@lru_cache(maxsize=None)
+def _regexes() -> Tuple[re.Pattern, re.Pattern, re.Pattern]:
+    epic_re = re.compile(r"^##\s+(EPIC\s+\d+)\s+—\s+(.*)$", re.MULTILINE)
+    task_re = re.compile(r"^###\s+Task\s+(\d+):\s+(.*)$", re.MULTILINE)
+    sub_re = re.compile(r"^####\s+(.*)$", re.MULTILINE)
+    return epic_re, task_re, sub_re
+
+
+def parse_task_list(text: str) -> List[Task]:
+    epic_re, task_re, sub_re = _regexes()
+
+    epics: List[Tuple[int, str, str]] = []
+    for em in epic_re.finditer(text):
+        epics.append((em.start(), em.group(1), em.group(2)))
+    epics.append((len(text), "", ""))
+
+    tasks: List[Task] = []
+    for i in range(len(epics)-1):
+        start, ecode, etitle = epics[i]
+        end = epics[i+1][0]
+        block = text[start:end]
+        for tm in task_re.finditer(block):
+            num = int(tm.group(1))
+            title = tm.group(2).strip()
+            tstart = tm.end()
+            next_task = task_re.search(block, tstart)
+            tend = next_task.start() if next_task else len(block)
+            subt_block = block[tstart:tend]
+            subs = [s.strip() for s in sub_re.findall(subt_block)]
+            tasks.append(Task(num, title, subs, ecode, etitle))
+    return tasks
+
+
+def load_task_list(task_list_path: Path) -> TaskModel:
+    return TaskModel(parse_task_list(Path(task_list_path).read_text(encoding='utf-8')))
+
+
+class TaskModelCache:
+    """Thread-safe cache of parsed task lists, invalidated by size/mtime."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, Tuple[int, int, TaskModel]] = {}
+        self.parses = 0
+
+    def get(self, task_list_path: Path) -> TaskModel:
+        path = Path(task_list_path).resolve()
+        st = path.stat()
+        with self._lock:
+            hit = self._entries.get(path)
+            if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                return hit[2]
+            model = load_task_list(path)
+            self._entries[path] = (st.st_size, st.st_mtime_ns, model)
+            self.parses += 1
+            return model
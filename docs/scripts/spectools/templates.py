@@ -0,0 +1,14 @@
+"""Instruction headers and stub template used by the generators.
+
+Kept in their own module so that callers which only parse `task-list.md`
+(e.g. daemon `parse` requests) never pay for loading them; `stubs` and
+`refine` import this module on first render.
+"""
+
+INSTRUCTIONS = '# INSTRUCTIONS FOR CLAUDE TO COMPLETE THIS TASK\n\n**READ THIS SECTION CAREFULLY BEFORE PROCEEDING**\n\nYou are being asked to expand this task stub into a complete, production-ready task specification for the **Agentic Coding Bot (Acode)**.\n\n## Required Sections and Quality Standards\n\nYour completed task MUST include all of the following sections with the specified level of detail:\n\n### 1. Header (Already Complete)\n- Priority, Tier, Complexity, Phase, Dependencies are already filled out\n- Do not modify these unless explicitly instructed by the task list\n\n### 2. Description (Expand)\n- **Length:** 3–6 paragraphs\n- Include: Business Value, Technical Details, Integration points (reference other tasks), Constraints/Considerations\n- Must clearly state what is **in scope** and **out of scope**\n\n### 3. Use Cases (3 scenarios)\nUse personas:\n- **Neil** (Owner/Developer)\n- **DevBot** (Automation runner)\n- **Jordan** (Contributor)\n\nEach scenario:\n- 10–15 lines\n- Before/After workflow\n- Explicit outcomes and verification cues\n\n### 4. User Manual Documentation\n- Overview\n- Step-by-step instructions (commands/config paths)\n- Settings/Configuration\n- Best Practices (5–7)\n- Troubleshooting (3–5)\n- **Length:** 150–300 lines (unless task requires more)\n\n### 5. Acceptance Criteria / Definition of Done\n- **Length:** 40–80 items (depending on task size)\n- Must be objectively verifiable checkboxes\n- Include categories: Functionality, Safety/Policy, UX/CLI, Logging/Audit, Performance, Docs, Tests\n\n### 6. Testing Requirements (All 5 types)\n- Unit tests (5–8)\n- Integration tests (3–5)\n- End-to-End tests (3–5)\n- Performance tests (3–4 benchmarks with targets)\n- Regression tests (list impacted areas or state N/A)\n\n### 7. User Verification Steps\n- 8–10 manual scenarios with “Verify:” expectations\n\n### 8. Implementation Prompt for Claude\n- 100–250 lines minimum\n- Include file paths, class names, interfaces, and why decisions are made\n- Must respect Clean Architecture boundaries (Domain → Application → Infrastructure → CLI)\n- Must include validation steps and next steps\n\n## Quality Checklist\n- [ ] No TODOs/placeholders remain\n- [ ] AC/DoD is measurable and complete\n- [ ] Tooling, safety, and docs are included\n- [ ] Fits the repo structure established by Task 000\n- [ ] References Task 001 constraints where applicable\n\n---\n\n**NOW PROCEED TO EXPAND THE TASK STUB BELOW INTO A COMPLETE SPECIFICATION**\n\n---\n\n'
+
+STUB_TEMPLATE = '# Task {task_num:03d}{suffix}: {title}\n\n**Priority:** {priority} / 49  \n**Tier:** {tier}  \n**Complexity:** {complexity} (Fibonacci points)  \n**Phase:** {phase}  \n**Dependencies:** {dependencies}  \n\n---\n\n## Description (EXPAND THIS)\n\n{stub_description}\n\n---\n\n## Use Cases (CREATE 3 DETAILED SCENARIOS)\n\n---\n\n## User Manual Documentation (WRITE COMPLETE DOCUMENTATION)\n\n---\n\n## Acceptance Criteria / Definition of Done (CREATE COMPREHENSIVE CHECKLIST)\n\n---\n\n## Testing Requirements (WRITE ALL 5 TEST TYPES)\n\n---\n\n## User Verification Steps (CREATE 8-10 MANUAL TESTS)\n\n---\n\n## Implementation Prompt for Claude (WRITE DETAILED GUIDE)\n\n---\n\n**END OF TASK {task_num:03d}{suffix}**\n'
+
+TASK_HEADER = '# INSTRUCTIONS FOR CLAUDE TO COMPLETE THIS TASK (REFINED SPEC TARGET)\n\nYou are expanding a **task stub** into a *complete, enterprise-grade, implementation-ready* specification for **Agentic Coding Bot (Acode)**.\n\nThese specs must be on par with our e-commerce task samples:\n- Typical length: **8,457–22,968 words** (target **~10k–18k** unless task is genuinely smaller/larger)\n- Acceptance Criteria / Definition of Done: typically **103–341 checkboxes** (target **~180–260**)\n\n## Non-negotiable quality bar\n- Write as if a mediocre automation engineer will implement it verbatim.\n- No “hand-wavy” language (avoid: *should*, *ideally*, *nice to have*). Use *MUST* and *MUST NOT*.\n- Every section must be objectively testable or auditable.\n- Respect Clean Architecture boundaries (Domain → Application → Infrastructure → CLI).\n- Respect Task 001 constraints (no external LLM APIs; mode rules).\n\n## Required Sections (all required; do not delete)\n1) Description\n   - 6–12 paragraphs\n   - Include: business value, scope boundaries, integration points (with task numbers), failure modes, assumptions\n2) Glossary / Terms (10–25 entries where relevant)\n3) Out-of-Scope (explicit bullets)\n4) Functional Requirements (grouped; 40–120 items)\n5) Non-Functional Requirements (security, performance, reliability; 20–60 items)\n6) User Manual Documentation\n   - 250–600 lines typical\n   - Include: quick start, config knobs, CLI examples, best practices, troubleshooting, FAQs\n7) Acceptance Criteria / Definition of Done\n   - Target: 180–260 checkbox items\n   - Must include categories: Functionality, Safety/Policy, CLI/UX, Logging/Audit, Performance, Docs, Tests, Compatibility\n8) Testing Requirements (all 5 types)\n   - Unit (15–30)\n   - Integration (10–20)\n   - E2E (8–15)\n   - Performance/Benchmarks (5–10, with targets)\n   - Regression (explicit impacted areas)\n9) User Verification Steps\n   - 12–20 scenarios with “Verify:” expectations\n10) Implementation Prompt\n   - 200–600 lines\n   - Must include: file paths, class/interface names, contracts, error codes, logging fields\n   - Must include “Validation checklist before merge”\n   - Must include “Rollout plan” (even if local-only)\n\n## Anti-footgun requirements\n- Specify exit codes for CLI errors\n- Specify logging schema fields\n- Specify default config values and precedence\n- Specify how secrets are redacted in logs/artifacts\n\n---\n\n'
+
+EPIC_HEADER = '# INSTRUCTIONS FOR CLAUDE TO COMPLETE THIS EPIC SUMMARY (REFINED SPEC TARGET)\n\nYou are expanding an **epic stub** into a complete EPIC specification for **Agentic Coding Bot (Acode)**.\n\nQuality bar:\n- This EPIC doc must make it easy to implement every task in the epic.\n- It must define boundaries, shared interfaces, and cross-cutting constraints.\n\n## Required Sections\n1) Epic Overview (purpose, boundaries, dependencies)\n2) Outcomes (10–25)\n3) Non-Goals (10–25)\n4) Architecture & Integration Points (interfaces, events, data contracts)\n5) Operational Considerations (modes/safety/audit)\n6) Acceptance Criteria / Definition of Done (50–120 checkboxes)\n7) Risks & Mitigations (12+)\n8) Milestone Plan (3–7 milestones mapping to tasks)\n9) “Definition of Epic Complete” checklist (20–40)\n\n---\n\n'
@@ -0,0 +1,21 @@
+"""Decoding of spec markdown files.
+
+Most of the corpus is UTF-8, but a few specs were saved as UTF-16 (with BOM)
+on Windows; decoding those as UTF-8 turns the whole file into one garbled
+section.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+
+def decode_markdown(data: bytes) -> str:
+    """UTF-16 if the bytes start with a UTF-16 BOM, else UTF-8 (BOM stripped, bad bytes replaced)."""
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return data.decode("utf-16")
+    return data.decode("utf-8-sig", errors="replace")
+
+
+def read_markdown(path: Path) -> str:
+    return decode_markdown(Path(path).read_bytes())
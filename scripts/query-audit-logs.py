@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""Indexed queries and span-tree reconstruction over audit JSONL logs.
+
+The indexer streams every `*.jsonl` log (docs/audit-event-schema.md) once and
+records, per event, the file and byte offset/length of its line together with
+sessionId, correlationId, eventType, spanId, parentSpanId and timestamp in a
+SQLite index. Keys are accepted in the schema doc's camelCase, PascalCase, and
+the snake_case that FileAuditWriter/JsonAuditLogger write; id records that
+serialize as `{"value": "..."}` are unwrapped, and eventType values written as
+the enum's int or snake_case name are stored under the schema's PascalCase name
+(as is --type). Logs are append-only, so re-indexing resumes at each file's
+last indexed offset; only new bytes are parsed. Files that shrank or were
+rewritten are re-indexed from scratch, deleted files are dropped.
+
+Queries then look up matching offsets in the index and seek straight to those
+lines instead of scanning every log. One index may be shared by several
+roots (--index); results are restricted to the paths given on the command line.
+
+Usage:
+  python query-audit-logs.py index .acode/logs
+  python query-audit-logs.py find .acode/logs --correlation corr_def456
+  python query-audit-logs.py find .acode/logs --session sess_x1y2z3 --type FileWrite --since 2026-01-11T15:31
+  python query-audit-logs.py tree .acode/logs --session sess_x1y2z3
+  python query-audit-logs.py stats .acode/logs
+
+`find` and `tree` update the index first (skip with --no-update).
+Exit codes: 0 = success (find: at least one match), 1 = no matches, 2 = usage error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_NAME = ".audit-index.sqlite"
+INDEX_VERSION = 2  # bump when stored values change; older indexes are rebuilt
+CHUNK_SIZE = 8 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_offset INTEGER NOT NULL,
+    first_ts TEXT,
+    last_ts TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ts TEXT,
+    session_id TEXT,
+    correlation_id TEXT,
+    event_type TEXT,
+    span_id TEXT,
+    parent_span_id TEXT,
+    event_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_file ON events(file_id, offset);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_events_correlation ON events(correlation_id, ts);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+"""
+
+# Canonical (camelCase) name -> accepted spellings; the C# writers use snake_case.
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "timestamp": ("timestamp", "Timestamp"),
+    "sessionId": ("sessionId", "SessionId", "session_id"),
+    "correlationId": ("correlationId", "CorrelationId", "correlation_id"),
+    "eventType": ("eventType", "EventType", "event_type"),
+    "spanId": ("spanId", "SpanId", "span_id"),
+    "parentSpanId": ("parentSpanId", "ParentSpanId", "parent_span_id"),
+    "eventId": ("eventId", "EventId", "event_id"),
+    "severity": ("severity", "Severity"),
+}
+# AuditEventType members in declaration order (src/Acode.Domain/Audit/AuditEventType.cs);
+# FileAuditWriter serializes the enum as this index, JsonAuditLogger as snake_case.
+EVENT_TYPES = (
+    "SessionStart", "SessionEnd", "ConfigLoad", "ConfigError", "ModeSelect", "CommandStart", "CommandEnd",
+    "CommandError", "FileRead", "FileWrite", "FileDelete", "DirCreate", "DirDelete", "ProtectedPathBlocked",
+    "SecurityViolation", "TaskStart", "TaskEnd", "TaskError", "ApprovalRequest", "ApprovalResponse",
+    "CodeGenerated", "TestExecution", "BuildExecution", "ErrorRecovery", "Shutdown",
+)
+_EVENT_TYPE_KEYS = {name.lower(): name for name in EVENT_TYPES}
+FIELDS = ("timestamp", "sessionId", "correlationId", "eventType", "spanId", "parentSpanId", "eventId")
+
+EventRow = Tuple[int, int, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+@dataclass
+class ScanResult:
+    path: str
+    start: int
+    end: int
+    rows: List[EventRow]
+    invalid: int = 0
+
+
+@dataclass
+class IndexStats:
+    files: int = 0
+    files_scanned: int = 0
+    files_reset: int = 0
+    files_removed: int = 0
+    events_added: int = 0
+    invalid_lines: int = 0
+    bytes_scanned: int = 0
+
+
+# ─── Indexing ────────────────────────────────────────────────────────────────
+
+
+def normalize_event_type(value: Any) -> Any:
+    """Schema (PascalCase) name for an eventType written as enum int or snake_case; unknown values pass through."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        n = int(value)
+        return EVENT_TYPES[n] if n < len(EVENT_TYPES) else str(value)
+    if isinstance(value, str):
+        return _EVENT_TYPE_KEYS.get(value.replace("_", "").lower(), value)
+    return value
+
+
+def event_field(ev: dict, name: str) -> Any:
+    """Value of canonical field `name` under any accepted spelling, with `{"value": x}` unwrapped to `x`."""
+    for key in ALIASES[name]:
+        if key in ev:
+            value = ev[key]
+            if isinstance(value, dict):
+                value = value.get("value", value.get("Value"))
+            return normalize_event_type(value) if name == "eventType" else value
+    return None
+
+
+def scan_log(path: str, start: int) -> ScanResult:
+    """Parse complete lines of `path` from byte `start`; a trailing partial line is left for next time."""
+    rows: List[EventRow] = []
+    invalid = 0
+    offset = start
+    loads = json.loads
+    with open(path, "rb") as f:
+        f.seek(start)
+        carry = b""
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            buf = carry + chunk
+            last_nl = buf.rfind(b"\n")
+            if last_nl == -1:
+                carry = buf
+                continue
+            carry = buf[last_nl + 1:]
+            pos = 0
+            for line in buf[:last_nl].split(b"\n"):
+                length = len(line) + 1
+                if line.strip():
+                    try:
+                        ev = loads(line)
+                    except ValueError:
+                        ev = None
+                    if isinstance(ev, dict):
+                        rows.append((offset + pos, length, *(event_field(ev, name) for name in FIELDS)))
+                    else:
+                        invalid += 1
+                pos += length
+            offset += pos
+    return ScanResult(path, start, offset, rows, invalid)
+
+
+def connect(index_path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(str(index_path))
+    db.execute("PRAGMA foreign_keys = ON")
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = NORMAL")
+    db.execute("PRAGMA cache_size = -65536")
+    if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        db.executescript("DROP TABLE IF EXISTS events; DROP TABLE IF EXISTS files;")
+        db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+
+def iter_logs(roots: List[Path]) -> Iterator[Path]:
+    for root in roots:
+        if root.is_file():
+            yield root.resolve()
+            continue
+        for p in sorted(root.rglob("*.jsonl")):
+            if p.is_file():
+                yield p.resolve()
+
+
+def update_index(db: sqlite3.Connection, roots: List[Path], jobs: Optional[int] = None) -> IndexStats:
+    stats = IndexStats()
+    known = {path: (fid, size, mtime, off) for fid, path, size, mtime, off in
+             db.execute("SELECT id, path, size, mtime_ns, indexed_offset FROM files")}
+    seen = set()
+    work: List[Tuple[str, int]] = []
+    for log in iter_logs(roots):
+        key = str(log)
+        seen.add(key)
+        stats.files += 1
+        st = log.stat()
+        prev = known.get(key)
+        if prev is None:
+            work.append((key, 0))
+            continue
+        fid, size, mtime, off = prev
+        if st.st_size == size and st.st_mtime_ns == mtime and off >= size:
+            continue
+        if st.st_size < off or (st.st_size == size and st.st_mtime_ns != mtime):
+            # Shrunk or rewritten in place: not append-only any more, start over.
+            db.execute("DELETE FROM events WHERE file_id = ?", (fid,))
+            db.execute("UPDATE files SET indexed_offset = 0, first_ts = NULL, last_ts = NULL WHERE id = ?", (fid,))
+            stats.files_reset += 1
+            work.append((key, 0))
+        else:
+            work.append((key, off))
+
+    # Only drop files under the roots being indexed; other roots may share the index.
+    resolved = [r.resolve() for r in roots]
+    for path, (fid, *_rest) in known.items():
+        if path not in seen and any(Path(path).is_relative_to(r) for r in resolved):
+            db.execute("DELETE FROM files WHERE id = ?", (fid,))
+            stats.files_removed += 1
+
+    if len(work) > 1 and (jobs or os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(scan_log, *zip(*work))
+            for result in results:
+                _store(db, result, stats)
+    else:
+        for path, start in work:
+            _store(db, scan_log(path, start), stats)
+    db.commit()
+    return stats
+
+
+def _store(db: sqlite3.Connection, result: ScanResult, stats: IndexStats) -> None:
+    st = os.stat(result.path)
+    db.execute(
+        "INSERT OR IGNORE INTO files (path, size, mtime_ns, indexed_offset) VALUES (?, ?, ?, 0)",
+        (result.path, st.st_size, st.st_mtime_ns),
+    )
+    fid = db.execute("SELECT id FROM files WHERE path = ?", (result.path,)).fetchone()[0]
+    db.executemany(
+        "INSERT INTO events (file_id, offset, length, ts, session_id, correlation_id, event_type, "
+        "span_id, parent_span_id, event_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((fid, *row) for row in result.rows),
+    )
+    timestamps = [r[2] for r in result.rows if r[2]]
+    db.execute(
+        "UPDATE files SET size = ?, mtime_ns = ?, indexed_offset = ?, "
+        "first_ts = COALESCE(first_ts, ?), last_ts = COALESCE(?, last_ts) WHERE id = ?",
+        (st.st_size, st.st_mtime_ns, result.end, min(timestamps, default=None), max(timestamps, default=None), fid),
+    )
+    stats.files_scanned += 1
+    stats.events_added += len(result.rows)
+    stats.invalid_lines += result.invalid
+    stats.bytes_scanned += result.end - result.start
+
+
+# ─── Queries ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Filters:
+    session: Optional[str] = None
+    correlation: Optional[str] = None
+    event_type: Optional[str] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+    limit: Optional[int] = None
+    roots: Optional[List[Path]] = None  # restrict to logs under these files/directories
+
+
+def _roots_clause(roots: List[Path]) -> Tuple[str, List[str]]:
+    """SQL condition on `fl.path` matching logs at or under `roots`."""
+    clauses, params = [], []
+    for root in roots:
+        root = root.resolve()
+        if root.is_dir():
+            prefix = str(root).rstrip(os.sep) + os.sep
+            clauses.append("substr(fl.path, 1, ?) = ?")
+            params += [len(prefix), prefix]
+        else:
+            clauses.append("fl.path = ?")
+            params.append(str(root))
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def query_locations(db: sqlite3.Connection, f: Filters) -> List[Tuple[str, int, int]]:
+    """Return (path, offset, length) of matching events, ordered by timestamp."""
+    clauses, params = [], []
+    if f.roots:
+        clause, root_params = _roots_clause(f.roots)
+        clauses.append(clause)
+        params += root_params
+    for column, value in (("e.session_id", f.session), ("e.correlation_id", f.correlation),
+                          ("e.event_type", normalize_event_type(f.event_type))):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if f.since:
+        clauses.append("e.ts >= ?")
+        params.append(f.since)
+    if f.until:
+        clauses.append("e.ts < ?")
+        params.append(f.until)
+    sql = ("SELECT fl.path, e.offset, e.length FROM events e JOIN files fl ON fl.id = e.file_id"
+           + (" WHERE " + " AND ".join(clauses) if clauses else "")
+           + " ORDER BY e.ts, fl.path, e.offset")
+    if f.limit:
+        sql += f" LIMIT {int(f.limit)}"
+    return db.execute(sql, params).fetchall()
+
+
+def read_events(locations: List[Tuple[str, int, int]]) -> List[bytes]:
+    """Seek to each location and read its line; files are opened once and read in offset order."""
+    by_file: Dict[str, List[Tuple[int, int, int]]] = {}
+    for i, (path, offset, length) in enumerate(locations):
+        by_file.setdefault(path, []).append((offset, length, i))
+    lines: List[Optional[bytes]] = [None] * len(locations)
+    for path, entries in by_file.items():
+        with open(path, "rb") as fh:
+            for offset, length, i in sorted(entries):
+                fh.seek(offset)
+                lines[i] = fh.read(length).rstrip(b"\r\n")
+    return [line for line in lines if line is not None]
+
+
+@dataclass
+class SpanNode:
+    span_id: Optional[str]
+    parent_span_id: Optional[str] = None
+    events: List[dict] = field(default_factory=list)
+    children: List["SpanNode"] = field(default_factory=list)
+    orphan: bool = False
+
+    @property
+    def start(self) -> str:
+        return min((event_field(e, "timestamp") or "" for e in self.events), default="")
+
+
+def build_span_trees(events: List[dict]) -> List[SpanNode]:
+    """Group events by spanId and link spans via parentSpanId.
+
+    Events without a spanId become single-event roots. Spans whose parent is
+    not among the events are returned as roots flagged `orphan`.
+    """
+    spans: Dict[str, SpanNode] = {}
+    roots: List[SpanNode] = []
+    for ev in events:
+        sid = event_field(ev, "spanId")
+        if sid is None:
+            roots.append(SpanNode(None, events=[ev]))
+            continue
+        node = spans.setdefault(sid, SpanNode(sid))
+        node.events.append(ev)
+        if node.parent_span_id is None and event_field(ev, "parentSpanId"):
+            node.parent_span_id = event_field(ev, "parentSpanId")
+
+    for node in spans.values():
+        parent = spans.get(node.parent_span_id) if node.parent_span_id else None
+        if parent is not None and parent is not node:
+            parent.children.append(node)
+        else:
+            node.orphan = node.parent_span_id is not None
+            roots.append(node)
+
+    def order(nodes: List[SpanNode]) -> None:
+        nodes.sort(key=lambda n: n.start)
+        for n in nodes:
+            n.events.sort(key=lambda e: event_field(e, "timestamp") or "")
+            order(n.children)
+
+    order(roots)
+    return roots
+
+
+def format_tree(roots: List[SpanNode]) -> str:
+    lines: List[str] = []
+
+    def walk(node: SpanNode, depth: int) -> None:
+        pad = "  " * depth
+        if node.span_id is not None:
+            note = f" (orphan: parent {node.parent_span_id} not found)" if node.orphan else ""
+            lines.append(f"{pad}{node.span_id}{note}")
+            pad += "  "
+        for ev in node.events:
+            lines.append(f"{pad}{event_field(ev, 'timestamp') or '?'}  {str(event_field(ev, 'eventType') or '?'):<20} "
+                         f"{event_field(ev, 'severity') or ''}  {event_field(ev, 'eventId') or ''}")
+        for child in node.children:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def tree_to_dict(node: SpanNode) -> dict:
+    return {"spanId": node.span_id, "parentSpanId": node.parent_span_id, "orphan": node.orphan,
+            "events": node.events, "children": [tree_to_dict(c) for c in node.children]}
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def _open_index(args: argparse.Namespace) -> Tuple[sqlite3.Connection, List[Path]]:
+    roots = [Path(p) for p in args.paths]
+    missing = [str(p) for p in roots if not p.exists()]
+    if missing:
+        raise SystemExit(f"error: not found: {', '.join(missing)}")
+    base = roots[0] if roots[0].is_dir() else roots[0].parent
+    return connect(Path(args.index) if args.index else base / INDEX_NAME), roots
+
+
+def _update(db: sqlite3.Connection, roots: List[Path], args: argparse.Namespace, verbose: bool) -> None:
+    t0 = time.perf_counter()
+    s = update_index(db, roots, args.jobs)
+    if verbose or s.files_scanned:
+        elapsed = time.perf_counter() - t0
+        print(f"indexed {s.files_scanned}/{s.files} files (+{s.events_added} events, {s.bytes_scanned / 1e6:.1f} MB, "
+              f"{s.files_reset} reset, {s.files_removed} removed, {s.invalid_lines} invalid lines) in {elapsed:.3f}s",
+              file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Index and query audit JSONL logs.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="*", default=[".acode/logs"], help="Log directories or files")
+    common.add_argument("--index", default=None, help=f"Index database (default: <first dir>/{INDEX_NAME})")
+    common.add_argument("--jobs", type=int, default=None, help="Worker processes for indexing")
+    query = argparse.ArgumentParser(add_help=False)
+    query.add_argument("--no-update", action="store_true", help="Query the index as is")
+    query.add_argument("--json", action="store_true", help="Machine-readable output")
+
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", parents=[common], help="Build or incrementally update the index")
+    sub.add_parser("stats", parents=[common], help="Show index statistics")
+    p = sub.add_parser("find", parents=[common, query], help="Print matching events")
+    p.add_argument("--session")
+    p.add_argument("--correlation")
+    p.add_argument("--type", dest="event_type", help="Event type: schema name, snake_case or enum number")
+    p.add_argument("--since", help="Inclusive ISO-8601 timestamp (prefixes like 2026-01-11T15 work)")
+    p.add_argument("--until", help="Exclusive ISO-8601 timestamp")
+    p.add_argument("--limit", type=int)
+    p = sub.add_parser("tree", parents=[common, query], help="Rebuild span trees for a session or correlation")
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument("--session")
+    group.add_argument("--correlation")
+    args = ap.parse_args(argv)
+
+    db, roots = _open_index(args)
+    try:
+        if args.command == "index":
+            _update(db, roots, args, verbose=True)
+            return 0
+        if args.command == "stats":
+            where, params = _roots_clause(roots)
+            files, lo, hi = db.execute(
+                f"SELECT COUNT(*), MIN(first_ts), MAX(last_ts) FROM files fl WHERE {where}", params).fetchone()
+            events, sessions = db.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT session_id) FROM events e JOIN files fl ON fl.id = e.file_id "
+                f"WHERE {where}", params).fetchone()
+            print(f"{files} files, {events} events, {sessions} sessions, {lo or '-'} .. {hi or '-'}")
+            for event_type, n in db.execute(
+                    f"SELECT event_type, COUNT(*) FROM events e JOIN files fl ON fl.id = e.file_id WHERE {where} "
+                    "GROUP BY event_type ORDER BY COUNT(*) DESC", params):
+                print(f"  {event_type or '(none)':<28} {n}")
+            return 0
+
+        if not args.no_update:
+            _update(db, roots, args, verbose=False)
+        filters = Filters(session=args.session, correlation=args.correlation, roots=roots)
+        if args.command == "find":
+            filters.event_type, filters.since, filters.until, filters.limit = \
+                args.event_type, args.since, args.until, args.limit
+        lines = read_events(query_locations(db, filters))
+        if not lines:
+            print("no matching events", file=sys.stderr)
+            return 1
+
+        if args.command == "find":
+            out = sys.stdout.buffer
+            if args.json:
+                out.write(b"[" + b",".join(lines) + b"]\n")
+            else:
+                for line in lines:
+                    out.write(line + b"\n")
+            return 0
+
+        roots_ = build_span_trees([json.loads(line) for line in lines])
+        if args.json:
+            json.dump([tree_to_dict(r) for r in roots_], sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            print(format_tree(roots_))
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
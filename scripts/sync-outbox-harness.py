@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""Offline throughput harness for draining `sync_outbox` (migrations/005_add_sync.sql).
+
+For each scenario a fresh local SQLite database is created from the real
+migrations (001 + 005), a producer fills `sync_outbox` at a configurable rate,
+and one or more drainers claim rows, push them to a local stand-in sync
+endpoint (HTTP on 127.0.0.1 with configurable latency) and acknowledge them.
+
+Drain strategies:
+- `row`:   claim one row at a time (SELECT oldest pending, UPDATE it to
+           'processing'), push it, ack it. Mirrors a naive GetPendingAsync(1) loop.
+- `batch`: claim N rows in one statement with
+           `UPDATE ... WHERE id IN (SELECT ... LIMIT N) RETURNING ...`,
+           push them in one request, ack them in one UPDATE.
+
+Reported per scenario: rows/s, lock contention (time spent waiting for the
+write lock and number of SQLITE_BUSY retries, for drainers and producer) and
+end-to-end lag (created_at -> processed_at, p50/p95/p99/max).
+
+Usage:
+  python sync-outbox-harness.py                                   # default comparison matrix
+  python sync-outbox-harness.py --prefill 20000 --rate 0          # drain a fixed backlog
+  python sync-outbox-harness.py --strategy batch --batch-size 50 200 --drainers 1 2 4 \\
+      --rate 3000 --duration 5 --latency-ms 2 --json results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MIGRATIONS = [REPO_ROOT / "migrations" / "001_initial_schema.sql", REPO_ROOT / "migrations" / "005_add_sync.sql"]
+
+# Short busy timeout so contention surfaces as counted retries instead of silent stalls.
+BUSY_TIMEOUT_S = 0.05
+
+
+@dataclass
+class Scenario:
+    strategy: str = "batch"
+    batch_size: int = 100
+    drainers: int = 1
+    rate: float = 2000.0          # rows/s produced while the producer runs (0 = prefill only)
+    duration: float = 3.0         # producer run time in seconds
+    prefill: int = 0              # rows inserted before draining starts
+    payload_bytes: int = 256
+    latency_ms: float = 1.0       # fixed endpoint latency per request
+    per_row_us: float = 20.0      # additional endpoint latency per row
+    drain_timeout: float = 30.0   # give up if the backlog is not empty this long after the producer stops
+
+    @property
+    def label(self) -> str:
+        size = f" n={self.batch_size}" if self.strategy == "batch" else ""
+        return f"{self.strategy}{size} x{self.drainers}"
+
+
+@dataclass
+class LockStats:
+    wait_s: float = 0.0
+    busy_retries: int = 0
+
+
+@dataclass
+class Result:
+    scenario: Scenario
+    produced: int = 0
+    drained: int = 0
+    remaining: int = 0
+    elapsed_s: float = 0.0
+    rows_per_s: float = 0.0
+    requests: int = 0
+    duplicates: int = 0
+    drainer_lock_wait_s: float = 0.0
+    drainer_busy_retries: int = 0
+    producer_lock_wait_s: float = 0.0
+    producer_busy_retries: int = 0
+    lag_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_S, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def create_database(db_path: Path) -> None:
+    conn = connect(db_path)
+    try:
+        for migration in MIGRATIONS:
+            conn.executescript(migration.read_text(encoding="utf-8"))
+    finally:
+        conn.close()
+
+
+def is_contention(e: sqlite3.OperationalError) -> bool:
+    return "locked" in str(e) or "busy" in str(e)
+
+
+def begin_immediate(conn: sqlite3.Connection, stats: LockStats) -> None:
+    t0 = time.perf_counter()
+    while True:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            break
+        except sqlite3.OperationalError as e:
+            if not is_contention(e):
+                raise
+            stats.busy_retries += 1
+    stats.wait_s += time.perf_counter() - t0
+
+
+def in_transaction(conn: sqlite3.Connection, stats: LockStats, body: Callable[[sqlite3.Connection], T]) -> T:
+    """Run `body(conn)` in an IMMEDIATE transaction, retrying the whole transaction on SQLITE_BUSY.
+
+    Every writer (producer and drainers) goes through here, so lock waits and
+    busy retries are counted the same way on both sides.
+    """
+    while True:
+        begin_immediate(conn, stats)
+        try:
+            result = body(conn)
+            conn.execute("COMMIT")
+            return result
+        except sqlite3.OperationalError as e:
+            conn.execute("ROLLBACK")
+            if not is_contention(e):
+                raise
+            stats.busy_retries += 1
+
+
+def run_write(conn: sqlite3.Connection, stats: LockStats, sql: str, params: Sequence = ()) -> List[tuple]:
+    """Run one write statement in its own IMMEDIATE transaction, retrying on SQLITE_BUSY."""
+    return in_transaction(conn, stats, lambda c: c.execute(sql, params).fetchall())
+
+
+# ─── Stand-in sync endpoint ──────────────────────────────────────────────────
+
+
+class SyncEndpoint:
+    """Local HTTP server accepting `POST /sync` with `{"entries": [...]}`."""
+
+    def __init__(self, latency_ms: float, per_row_us: float) -> None:
+        self.latency_ms = latency_ms
+        self.per_row_us = per_row_us
+        self.requests = 0
+        self.seen: set = set()
+        self.duplicates = 0
+        self._lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without TCP_NODELAY every
+            # small response stalls on delayed ACKs and row-at-a-time drains look ~40x slower.
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                entries = body["entries"]
+                time.sleep((endpoint.latency_ms / 1000) + (endpoint.per_row_us / 1e6) * len(entries))
+                with endpoint._lock:
+                    endpoint.requests += 1
+                    for entry in entries:
+                        if entry["id"] in endpoint.seen:
+                            endpoint.duplicates += 1
+                        endpoint.seen.add(entry["id"])
+                reply = json.dumps({"accepted": len(entries)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "SyncEndpoint":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class SyncClient:
+    def __init__(self, port: int) -> None:
+        self._conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    def push(self, entries: List[dict]) -> None:
+        body = json.dumps({"entries": entries})
+        self._conn.request("POST", "/sync", body=body, headers={"Content-Type": "application/json"})
+        response = self._conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"sync endpoint returned {response.status}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ─── Producer and drainers ───────────────────────────────────────────────────
+
+INSERT_SQL = """
+    INSERT INTO sync_outbox (id, entity_type, entity_id, operation, payload, status, created_at)
+    VALUES (?, 'session', ?, 'update', ?, 'pending', ?)
+"""
+
+
+def make_rows(n: int, payload: str) -> List[tuple]:
+    now = utc_now()
+    return [(uuid.uuid4().hex, uuid.uuid4().hex[:12], payload, now) for _ in range(n)]
+
+
+def insert_rows(conn: sqlite3.Connection, stats: LockStats, rows: List[tuple]) -> None:
+    in_transaction(conn, stats, lambda c: c.executemany(INSERT_SQL, rows))
+
+
+def produce(db_path: Path, scenario: Scenario, stop: threading.Event, stats: LockStats, counter: List[int]) -> None:
+    """Insert rows at `scenario.rate` rows/s in 10 ms ticks until `stop` is set."""
+    conn = connect(db_path)
+    payload = json.dumps({"data": "x" * scenario.payload_bytes})
+    start = time.perf_counter()
+    try:
+        while not stop.is_set():
+            due = int((time.perf_counter() - start) * scenario.rate) - counter[0]
+            if due > 0:
+                insert_rows(conn, stats, make_rows(due, payload))
+                counter[0] += due
+            time.sleep(0.01)
+    finally:
+        conn.close()
+
+
+def _entry(row: tuple) -> dict:
+    return {"id": row[0], "entity_type": row[1], "entity_id": row[2], "operation": row[3], "payload": row[4]}
+
+
+CLAIM_ONE_SELECT = """
+    SELECT id, entity_type, entity_id, operation, payload FROM sync_outbox
+    WHERE status = 'pending' ORDER BY created_at LIMIT 1
+"""
+CLAIM_ONE_UPDATE = "UPDATE sync_outbox SET status = 'processing' WHERE id = ? AND status = 'pending'"
+ACK_ONE = "UPDATE sync_outbox SET status = 'completed', processed_at = ? WHERE id = ?"
+
+CLAIM_BATCH = """
+    UPDATE sync_outbox SET status = 'processing'
+    WHERE id IN (SELECT id FROM sync_outbox WHERE status = 'pending' ORDER BY created_at LIMIT ?)
+    RETURNING id, entity_type, entity_id, operation, payload
+"""
+ACK_BATCH = """
+    UPDATE sync_outbox SET status = 'completed', processed_at = ?
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+
+def claim_row(conn: sqlite3.Connection, stats: LockStats) -> Optional[tuple]:
+    def claim(c: sqlite3.Connection) -> Optional[tuple]:
+        row = c.execute(CLAIM_ONE_SELECT).fetchone()
+        if row is not None:
+            c.execute(CLAIM_ONE_UPDATE, (row[0],))
+        return row
+
+    return in_transaction(conn, stats, claim)
+
+
+def drain(db_path: Path, scenario: Scenario, port: int, done: threading.Event, stats: LockStats,
+          counter: List[int], counter_lock: threading.Lock) -> None:
+    """Claim/push/ack until the outbox is empty and `done` (producer finished) is set."""
+    conn = connect(db_path)
+    client = SyncClient(port)
+    try:
+        while True:
+            if scenario.strategy == "row":
+                row = claim_row(conn, stats)
+                rows = [row] if row is not None else []
+            else:
+                rows = run_write(conn, stats, CLAIM_BATCH, (scenario.batch_size,))
+            if not rows:
+                if done.is_set():
+                    return
+                time.sleep(0.005)
+                continue
+            client.push([_entry(r) for r in rows])
+            if scenario.strategy == "row":
+                run_write(conn, stats, ACK_ONE, (utc_now(), rows[0][0]))
+            else:
+                run_write(conn, stats, ACK_BATCH, (utc_now(), json.dumps([r[0] for r in rows])))
+            with counter_lock:
+                counter[0] += len(rows)
+    finally:
+        client.close()
+        conn.close()
+
+
+# ─── Scenario runner ─────────────────────────────────────────────────────────
+
+
+def _parse_ts(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def lag_percentiles(conn: sqlite3.Connection) -> Dict[str, float]:
+    lags = sorted(
+        (_parse_ts(done) - _parse_ts(created)) * 1000
+        for created, done in conn.execute(
+            "SELECT created_at, processed_at FROM sync_outbox WHERE status = 'completed'"
+        )
+    )
+    if not lags:
+        return {}
+
+    def pct(p: float) -> float:
+        return round(lags[min(len(lags) - 1, int(p * len(lags)))], 2)
+
+    return {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(lags[-1], 2),
+            "mean": round(statistics.fmean(lags), 2)}
+
+
+def run_scenario(scenario: Scenario, workdir: Path) -> Result:
+    db_path = workdir / f"outbox-{uuid.uuid4().hex[:8]}.db"
+    create_database(db_path)
+    setup = connect(db_path)
+    producer_stats = LockStats()
+    if scenario.prefill:
+        payload = json.dumps({"data": "x" * scenario.payload_bytes})
+        insert_rows(setup, producer_stats, make_rows(scenario.prefill, payload))
+        producer_stats = LockStats()
+
+    produced = [0]
+    drained = [0]
+    drained_lock = threading.Lock()
+    stop_producer = threading.Event()
+    producer_done = threading.Event()
+    drainer_stats = [LockStats() for _ in range(scenario.drainers)]
+
+    with SyncEndpoint(scenario.latency_ms, scenario.per_row_us) as endpoint:
+        producer = threading.Thread(target=produce, args=(db_path, scenario, stop_producer, producer_stats, produced))
+        drainers = [
+            threading.Thread(target=drain, args=(db_path, scenario, endpoint.port, producer_done, s, drained, drained_lock),
+                             daemon=True)
+            for s in drainer_stats
+        ]
+        start = time.perf_counter()
+        if scenario.rate > 0:
+            producer.start()
+        for t in drainers:
+            t.start()
+        if scenario.rate > 0:
+            time.sleep(scenario.duration)
+            stop_producer.set()
+            producer.join()
+        producer_done.set()
+        deadline = time.monotonic() + scenario.drain_timeout
+        for t in drainers:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        elapsed = time.perf_counter() - start
+        requests, duplicates = endpoint.requests, endpoint.duplicates
+
+    result = Result(
+        scenario=scenario,
+        produced=scenario.prefill + produced[0],
+        drained=drained[0],
+        remaining=setup.execute("SELECT COUNT(*) FROM sync_outbox WHERE status != 'completed'").fetchone()[0],
+        elapsed_s=round(elapsed, 3),
+        rows_per_s=round(drained[0] / elapsed, 1) if elapsed else 0.0,
+        requests=requests,
+        duplicates=duplicates,
+        drainer_lock_wait_s=round(sum(s.wait_s for s in drainer_stats), 3),
+        drainer_busy_retries=sum(s.busy_retries for s in drainer_stats),
+        producer_lock_wait_s=round(producer_stats.wait_s, 3),
+        producer_busy_retries=producer_stats.busy_retries,
+        lag_ms=lag_percentiles(setup),
+    )
+    setup.close()
+    return result
+
+
+def build_matrix(args: argparse.Namespace) -> List[Scenario]:
+    scenarios = []
+    for strategy in args.strategy:
+        sizes = args.batch_size if strategy == "batch" else [1]
+        for size in sizes:
+            for drainers in args.drainers:
+                scenarios.append(Scenario(
+                    strategy=strategy, batch_size=size, drainers=drainers, rate=args.rate,
+                    duration=args.duration, prefill=args.prefill, payload_bytes=args.payload_bytes,
+                    latency_ms=args.latency_ms, per_row_us=args.per_row_us, drain_timeout=args.drain_timeout,
+                ))
+    return scenarios
+
+
+def format_table(results: List[Result]) -> str:
+    header = (f"{'scenario':<20} {'rows':>7} {'left':>6} {'rows/s':>9} {'reqs':>7} "
+              f"{'lockwait s':>10} {'busy':>6} {'prod busy':>9} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.scenario.label:<20} {r.drained:>7} {r.remaining:>6} {r.rows_per_s:>9.1f} {r.requests:>7} "
+            f"{r.drainer_lock_wait_s:>10.3f} {r.drainer_busy_retries:>6} {r.producer_busy_retries:>9} "
+            f"{r.lag_ms.get('p50', 0):>9.1f} {r.lag_ms.get('p99', 0):>9.1f} {r.lag_ms.get('max', 0):>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Compare sync_outbox drain strategies against a local SQLite outbox.")
+    ap.add_argument("--strategy", nargs="+", choices=["row", "batch"], default=["row", "batch"])
+    ap.add_argument("--batch-size", dest="batch_size", nargs="+", type=int, default=[10, 100, 500])
+    ap.add_argument("--drainers", nargs="+", type=int, default=[1, 4])
+    ap.add_argument("--rate", type=float, default=2000.0, help="Producer rows/s (0 = prefill only)")
+    ap.add_argument("--duration", type=float, default=3.0, help="Producer run time in seconds")
+    ap.add_argument("--prefill", type=int, default=0, help="Backlog rows inserted before draining")
+    ap.add_argument("--payload-bytes", dest="payload_bytes", type=int, default=256)
+    ap.add_argument("--latency-ms", dest="latency_ms", type=float, default=1.0, help="Endpoint latency per request")
+    ap.add_argument("--per-row-us", dest="per_row_us", type=float, default=20.0, help="Endpoint latency per row")
+    ap.add_argument("--drain-timeout", dest="drain_timeout", type=float, default=30.0)
+    ap.add_argument("--workdir", default=None, help="Directory for scenario databases (default: temp dir)")
+    ap.add_argument("--json", dest="json_out", default=None, help="Also write results as JSON to this path")
+    args = ap.parse_args(argv)
+
+    if args.rate <= 0 and args.prefill <= 0:
+        ap.error("nothing to drain: set --rate > 0 or --prefill > 0")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = []
+        for scenario in build_matrix(args):
+            print(f"running {scenario.label} ...", file=sys.stderr)
+            results.append(run_scenario(scenario, workdir))
+
+    print(format_table(results))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+    return 1 if any(r.remaining or r.duplicates for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
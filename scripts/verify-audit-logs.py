@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""Parallel integrity verifier for audit JSONL logs (docs/audit-event-schema.md).
+
+Two sidecar formats are understood:
+- `<log>.checksum`: one lowercase SHA-256 hex digest per line; line N of the
+  checksum file is the hash of line N of the log (without its line ending).
+  This is the format described in docs/audit-event-schema.md.
+- `<log>.sha256`: a single SHA-256 of the whole file, as written by
+  FileAuditWriter / AuditIntegrityVerifier.
+
+Performance:
+- Files are hashed across a process pool; large files are memory-mapped and
+  fed to hashlib in large blocks (hashlib releases the GIL).
+- A state file records (log size, log mtime, checksum signature) for every
+  verified log; unchanged logs are skipped on the next run.
+- Logs with a per-line `.checksum` that only grew since the last run are
+  verified incrementally from the recorded byte offset (bytes before it are
+  trusted as append-only; use `--full` to re-verify them). This needs the
+  already-verified prefix of the `.checksum` to be byte-identical (its length
+  and SHA-256 are in the state file); any other change re-verifies from 0. `--follow` keeps
+  polling and also hashes `.sha256` logs incrementally (the running hash is
+  kept in memory).
+- A summary reports bytes hashed and throughput in GB/s.
+
+Usage:
+  python verify-audit-logs.py .acode/logs
+  python verify-audit-logs.py .acode/logs --jobs 8 --full
+  python verify-audit-logs.py .acode/logs --follow --interval 2
+
+Exit codes: 0 = all verified, 1 = integrity failures, 2 = usage error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+STATE_NAME = ".verify-state.json"
+STATE_VERSION = 2
+BLOCK_SIZE = 16 * 1024 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+
+OK = "ok"
+PARTIAL = "partial"          # growing log: trailing lines not yet covered by the checksum file
+MISMATCH = "mismatch"
+NO_CHECKSUM = "no-checksum"
+ERROR = "error"
+
+
+@dataclass
+class Job:
+    path: str
+    mode: str                   # lines | file
+    checksum_sig: str
+    start_offset: int = 0
+    start_line: int = 0
+
+
+@dataclass
+class Outcome:
+    path: str
+    status: str
+    detail: str = ""
+    mode: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+    checksum_sig: str = ""
+    offset: int = 0             # bytes of the log covered by verified lines
+    lines: int = 0              # lines verified (per-line mode)
+    bytes_hashed: int = 0
+    checksum_prefix: int = 0    # bytes of the .checksum covering the verified lines
+    checksum_prefix_sha: str = ""
+
+
+def _sidecars(log: Path) -> Tuple[Optional[str], Optional[Path]]:
+    per_line = log.with_name(log.name + ".checksum")
+    if per_line.exists():
+        return "lines", per_line
+    whole = log.with_name(log.name + ".sha256")
+    if whole.exists():
+        return "file", whole
+    return None, None
+
+
+def checksum_signature(mode: str, sidecar: Path) -> str:
+    """Cheap identity of a sidecar: the digest itself for `.sha256`, size/mtime for `.checksum`."""
+    if mode == "file":
+        return sidecar.read_text(encoding="ascii").strip().lower()
+    st = sidecar.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+class _Mapped:
+    """Read-only view of a file: mmap for large files, one read for small ones."""
+
+    def __init__(self, path: str) -> None:
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._mm: Optional[mmap.mmap] = None
+        if size >= MMAP_THRESHOLD:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = self._mm
+        else:
+            self.data = self._f.read()
+        self.size = len(self.data)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "_Mapped":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def hash_range(data, start: int, end: int, h=None):
+    """Feed `data[start:end]` to a SHA-256 in BLOCK_SIZE slices without copying."""
+    h = h or hashlib.sha256()
+    view = memoryview(data)
+    try:
+        for i in range(start, end, BLOCK_SIZE):
+            h.update(view[i:min(i + BLOCK_SIZE, end)])
+    finally:
+        view.release()
+    return h
+
+
+def _prefix_end(raw: bytes, lines: int) -> int:
+    """Byte length of the first `lines` lines of `raw`, including their newlines."""
+    pos = 0
+    for _ in range(lines):
+        nl = raw.find(b"\n", pos)
+        if nl == -1:
+            return len(raw)
+        pos = nl + 1
+    return pos
+
+
+def checksum_prefix_unchanged(log: str, prev: dict) -> bool:
+    """True if the `.checksum` still starts with the exact bytes that covered the verified lines."""
+    length = prev.get("checksum_prefix", 0)
+    try:
+        with open(log + ".checksum", "rb") as f:
+            prefix = f.read(length)
+    except OSError:
+        return False
+    return len(prefix) == length and hashlib.sha256(prefix).hexdigest() == prev.get("checksum_prefix_sha")
+
+
+def _verify_lines(job: Job, m: _Mapped, out: Outcome) -> None:
+    raw = Path(job.path + ".checksum").read_bytes()
+    sidecar = raw.split(b"\n")
+    if sidecar and sidecar[-1].strip() == b"":
+        sidecar.pop()
+    data = m.data
+    pos, line_no = job.start_offset, job.start_line
+    sha256 = hashlib.sha256
+    for expected in sidecar[job.start_line:]:
+        nl = data.find(b"\n", pos)
+        if nl == -1:
+            break
+        end = nl - 1 if nl > pos and data[nl - 1] == 0x0D else nl
+        if sha256(data[pos:end]).hexdigest().encode() != expected.strip().lower():
+            out.status, out.detail = MISMATCH, f"line {line_no + 1} does not match its checksum"
+            break
+        out.bytes_hashed += end - pos
+        pos, line_no = nl + 1, line_no + 1
+
+    out.offset, out.lines = pos, line_no
+    out.checksum_prefix = _prefix_end(raw, line_no)
+    out.checksum_prefix_sha = hashlib.sha256(raw[:out.checksum_prefix]).hexdigest()
+    if out.status == MISMATCH:
+        return
+    if line_no < len(sidecar):
+        out.status, out.detail = MISMATCH, f"log truncated: {len(sidecar) - line_no} checksummed lines missing"
+    elif data.find(b"\n", pos) != -1:
+        out.status, out.detail = PARTIAL, "log has lines not yet covered by the checksum file"
+    else:
+        out.status = OK
+
+
+def verify(job: Job) -> Outcome:
+    """Worker entry point: verify one log (whole, or from `job.start_offset`)."""
+    out = Outcome(job.path, ERROR, mode=job.mode, checksum_sig=job.checksum_sig)
+    try:
+        st = os.stat(job.path)
+        out.size, out.mtime_ns = st.st_size, st.st_mtime_ns
+        with _Mapped(job.path) as m:
+            if job.mode == "lines":
+                _verify_lines(job, m, out)
+            else:
+                digest = hash_range(m.data, 0, m.size).hexdigest()
+                out.bytes_hashed = out.offset = m.size
+                out.status = OK if digest == job.checksum_sig else MISMATCH
+                if out.status == MISMATCH:
+                    out.detail = "whole-file SHA-256 does not match .sha256"
+    except (OSError, ValueError) as e:
+        out.status, out.detail = ERROR, f"{type(e).__name__}: {e}"
+    return out
+
+
+# ─── State and planning ──────────────────────────────────────────────────────
+
+
+def load_state(path: Path) -> Dict[str, dict]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return raw.get("files", {}) if raw.get("version") == STATE_VERSION else {}
+
+
+def save_state(path: Path, state: Dict[str, dict]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": STATE_VERSION, "files": state}, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def iter_logs(roots: List[Path]) -> Iterator[Path]:
+    for root in roots:
+        if root.is_file():
+            yield root.resolve()
+            continue
+        for p in sorted(root.rglob("*.jsonl")):
+            if p.is_file():
+                yield p.resolve()
+
+
+def plan(logs: List[Path], state: Dict[str, dict], full: bool) -> Tuple[List[Job], List[Outcome], int]:
+    """Split logs into jobs to run, immediate outcomes (no checksum) and a count of skipped files."""
+    jobs: List[Job] = []
+    immediate: List[Outcome] = []
+    skipped = 0
+    for log in logs:
+        key = str(log)
+        mode, sidecar = _sidecars(log)
+        if mode is None:
+            immediate.append(Outcome(key, NO_CHECKSUM, "no .checksum or .sha256 sidecar"))
+            continue
+        sig = checksum_signature(mode, sidecar)
+        st = log.stat()
+        prev = state.get(key)
+        if not full and prev and prev["status"] == OK and prev["mode"] == mode:
+            if (prev["size"], prev["mtime_ns"], prev["checksum_sig"]) == (st.st_size, st.st_mtime_ns, sig):
+                skipped += 1
+                continue
+        job = Job(key, mode, sig)
+        # Append-only growth of a per-line log: resume after the last verified line, but only
+        # if the checksums already verified are byte-identical. A log rewritten in place (same
+        # size, new mtime) or an edited .checksum is re-verified from the start.
+        grew = prev and (st.st_size > prev["size"] or (st.st_size, st.st_mtime_ns) == (prev["size"], prev["mtime_ns"]))
+        if (not full and grew and mode == "lines" and prev["mode"] == "lines" and prev["status"] in (OK, PARTIAL)
+                and checksum_prefix_unchanged(key, prev)):
+            job.start_offset, job.start_line = prev["offset"], prev["lines"]
+        jobs.append(job)
+    return jobs, immediate, skipped
+
+
+def run_jobs(jobs: List[Job], workers: Optional[int]) -> List[Outcome]:
+    if len(jobs) <= 1 or workers == 1:
+        return [verify(j) for j in jobs]
+    # Biggest files first so one large log does not end up alone at the tail.
+    jobs = sorted(jobs, key=lambda j: os.path.getsize(j.path) - j.start_offset, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify, jobs))
+
+
+def record(state: Dict[str, dict], outcomes: List[Outcome]) -> None:
+    for o in outcomes:
+        if o.status in (OK, PARTIAL):
+            state[o.path] = asdict(o)
+        else:
+            state.pop(o.path, None)
+
+
+# ─── Follow mode ─────────────────────────────────────────────────────────────
+
+
+class Follower:
+    """Incrementally re-verifies growing logs; keeps running hashes for `.sha256` logs."""
+
+    def __init__(self, state: Dict[str, dict]) -> None:
+        self.state = state
+        self._running: Dict[str, Tuple[object, int]] = {}   # path -> (sha256 state, offset)
+
+    def _file_mode(self, log: str, sig: str) -> Outcome:
+        st = os.stat(log)
+        out = Outcome(log, OK, mode="file", size=st.st_size, mtime_ns=st.st_mtime_ns, checksum_sig=sig)
+        h, offset = self._running.get(log, (None, 0))
+        if h is None or st.st_size < offset:
+            h, offset = hashlib.sha256(), 0
+        if st.st_size > offset:
+            with _Mapped(log) as m:
+                hash_range(m.data, offset, m.size, h)
+                out.bytes_hashed = m.size - offset
+                offset = m.size
+        self._running[log] = (h, offset)
+        out.offset = offset
+        if h.copy().hexdigest() != sig:
+            # The writer updates the sidecar after each line; give it one poll to catch up.
+            out.status, out.detail = PARTIAL, "whole-file SHA-256 does not match .sha256 (yet)"
+        return out
+
+    def poll(self, logs: List[Path]) -> List[Outcome]:
+        jobs, outcomes, _ = plan(logs, self.state, full=False)
+        for job in jobs:
+            if job.mode == "file":
+                prev = self.state.get(job.path)
+                o = self._file_mode(job.path, job.checksum_sig)
+                if o.status == PARTIAL and prev and prev.get("status") == PARTIAL and prev.get("size") == o.size:
+                    o.status, o.detail = MISMATCH, "whole-file SHA-256 does not match .sha256"
+                outcomes.append(o)
+            else:
+                outcomes.append(verify(job))
+        record(self.state, outcomes)
+        return outcomes
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+
+
+def summarize(outcomes: List[Outcome], skipped: int, elapsed: float) -> str:
+    hashed = sum(o.bytes_hashed for o in outcomes)
+    counts: Dict[str, int] = {}
+    for o in outcomes:
+        counts[o.status] = counts.get(o.status, 0) + 1
+    parts = ", ".join(f"{n} {s}" for s, n in sorted(counts.items())) or "nothing to verify"
+    gbps = hashed / elapsed / 1e9 if elapsed > 0 else 0.0
+    return f"{len(outcomes) + skipped} logs: {parts}, {skipped} unchanged (skipped); " \
+           f"{hashed / 1e6:.1f} MB hashed in {elapsed:.3f}s ({gbps:.2f} GB/s)"
+
+
+def report(outcomes: List[Outcome]) -> bool:
+    failed = False
+    for o in outcomes:
+        if o.status in (MISMATCH, ERROR, NO_CHECKSUM):
+            failed = True
+            print(f"{o.status.upper()}: {o.path}: {o.detail}")
+        elif o.status == PARTIAL:
+            print(f"PARTIAL: {o.path}: {o.detail}", file=sys.stderr)
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Verify audit JSONL logs against their SHA-256 sidecars.")
+    ap.add_argument("paths", nargs="*", default=[".acode/logs"], help="Log directories or files")
+    ap.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--state", default=None, help=f"State file (default: <first dir>/{STATE_NAME})")
+    ap.add_argument("--full", action="store_true", help="Ignore recorded state and re-verify every byte")
+    ap.add_argument("--follow", action="store_true", help="Keep polling and verify logs as they grow")
+    ap.add_argument("--interval", type=float, default=2.0, help="Polling interval for --follow (seconds)")
+    args = ap.parse_args(argv)
+
+    roots = [Path(p) for p in args.paths]
+    missing = [str(p) for p in roots if not p.exists()]
+    if missing:
+        print(f"error: not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    base = roots[0] if roots[0].is_dir() else roots[0].parent
+    state_path = Path(args.state) if args.state else base / STATE_NAME
+    state = {} if args.full else load_state(state_path)
+
+    if args.follow:
+        follower = Follower(state)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                outcomes = follower.poll(list(iter_logs(roots)))
+                if outcomes:
+                    report(outcomes)
+                    print(summarize(outcomes, 0, time.perf_counter() - t0), file=sys.stderr)
+                save_state(state_path, state)
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            save_state(state_path, state)
+            return 0
+
+    t0 = time.perf_counter()
+    jobs, outcomes, skipped = plan(list(iter_logs(roots)), state, args.full)
+    outcomes += run_jobs(jobs, args.jobs)
+    elapsed = time.perf_counter() - t0
+    record(state, outcomes)
+    save_state(state_path, state)
+
+    failed = report(outcomes)
+    print(summarize(outcomes, skipped, elapsed), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Helpers for importing the docs/scripts tooling from tests."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = REPO_ROOT / "docs" / "scripts"
+
+# Make the importable `spectools` package visible to the tests.
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(filename: str):
+    """Import a hyphen-named script from docs/scripts as a module.
+
+    The module is registered in sys.modules so worker processes can pickle
+    its functions.
+    """
+    name = filename.replace("-", "_").removesuffix(".py")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for docs/scripts/check-doc-links.py."""
+
+from pathlib import Path
+
+import pytest
+
+from docs_scripts import load_script
+
+cdl = load_script("check-doc-links.py")
+
+
+def write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    write(tmp_path / "a.md", "# Title\n\n## Setup & Install\n\n## Setup & Install\n\nSee [b](sub/b.md#usage).\n")
+    write(tmp_path / "sub" / "b.md", "Usage\n-----\n\nBack to [a](../a.md#setup--install-1) and [x](https://example.com).\n")
+    return tmp_path
+
+
+class TestParsing:
+    def test_github_slugs_with_duplicates(self):
+        anchors, _ = cdl.parse_markdown("# Hello, World!\n## Hello, World!\n### `Code` [link](x.md)\n")
+        assert anchors == ["hello-world", "hello-world-1", "code-link"]
+
+    def test_html_anchor_and_setext(self):
+        anchors, _ = cdl.parse_markdown('#### <a name="mit-001"></a>MIT-001\n\nIntro\n=====\n')
+        assert "mit-001" in anchors
+        assert "intro" in anchors
+
+    def test_links_in_code_are_ignored(self):
+        _, links = cdl.parse_markdown("```\n[x](missing.md)\n```\nUse `[y](nope.md)` or [z](real.md)\n")
+        assert links == [(4, "real.md")]
+
+
+class TestResolution:
+    def test_clean_tree_has_no_broken_links(self, tree: Path):
+        index, rescanned = cdl.build_index(tree, {}, jobs=1)
+        assert rescanned == 2
+        assert cdl.resolve_links(tree, index) == []
+
+    def test_reports_missing_file_and_anchor(self, tree: Path):
+        write(tree / "c.md", "[gone](nope.md) [bad](a.md#nowhere) [self](#here)\n\n# Here\n")
+        index, _ = cdl.build_index(tree, {}, jobs=1)
+        reasons = {(b.target, b.reason) for b in cdl.resolve_links(tree, index)}
+        assert reasons == {("nope.md", "missing file"), ("a.md#nowhere", "missing anchor")}
+
+    def test_cache_only_rescans_changed_files(self, tree: Path, tmp_path_factory):
+        cache_path = tmp_path_factory.mktemp("cache") / "index.json"
+        index, _ = cdl.build_index(tree, {}, jobs=1)
+        cdl.save_cache(cache_path, index)
+
+        write(tree / "a.md", "# Title\n\nchanged\n")
+        index, rescanned = cdl.build_index(tree, cdl.load_cache(cache_path), jobs=1)
+        assert rescanned == 1
+        assert [b.target for b in cdl.resolve_links(tree, index)] == ["../a.md#setup--install-1"]
+
+    def test_main_exit_codes(self, tree: Path):
+        assert cdl.main(["--root", str(tree), "--no-cache"]) == 0
+        write(tree / "d.md", "[gone](nope.md)\n")
+        assert cdl.main(["--root", str(tree), "--no-cache"]) == 1
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Tests for the spectools dependency DAG, refinement waves and critical path."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from docs_scripts import load_script  # also puts docs/scripts on sys.path
+
+from spectools.__main__ import main as spectools_main
+from spectools.daemon import Dispatcher, RpcError
+from spectools.refine import refine_tree
+from spectools.schedule import (CycleError, GraphCache, build_graph, build_schedule, find_cycles,
+                                read_spec_header, topological_waves)
+from spectools.stubs import generate_stubs
+from spectools.tasklist import load_task_list
+
+TASK_LIST = """# Full task list
+
+## EPIC 0 — Foundations
+
+### Task 000: Project Bootstrap
+
+#### Create solution
+
+#### Add docs
+
+### Task 001: Operating Modes
+
+## EPIC 1 — Runtime
+
+### Task 004: Model Provider Interface
+
+#### Define interface
+
+### Task 005: Ollama Provider
+"""
+
+
+def spec(tid: str, deps: str, complexity: int = 8) -> str:
+    return (f"# Task {tid}: Title\n\n**Priority:** P0  \n**Complexity:** {complexity} (Fibonacci points)  \n"
+            f"**Dependencies:** {deps}  \n\n---\n\n## Description\n\nMentions Task 999 in prose.\n")
+
+
+@pytest.fixture
+def corpus(tmp_path: Path):
+    task_list = tmp_path / "task-list.md"
+    task_list.write_text(TASK_LIST, encoding="utf-8")
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "task-001.md").write_text(spec("001", "Task 000 (Bootstrap)"), encoding="utf-8")
+    (specs / "task-004.md").write_text(spec("004", "Task 001, Task 000.b (Docs), Task 077", 13), encoding="utf-8")
+    (specs / "task-005.md").write_text(spec("005", "Task 004.a (Interface)", 21), encoding="utf-8")
+    return task_list, specs
+
+
+def test_read_spec_header_ignores_prose_and_instructions():
+    md = "# INSTRUCTIONS FOR CLAUDE\n\n- Dependencies are already filled out\n\n" + spec("040.a", "Task 040, Task 040")
+    assert read_spec_header(md) == ("040.a", ["040"], 8)
+    assert read_spec_header(spec("010", "TBD"))[1] == []
+    assert read_spec_header("# EPIC 00 — Foundations\n") is None
+
+
+def test_graph_waves_and_critical_path(corpus):
+    task_list, specs = corpus
+    graph = build_graph(load_task_list(task_list), [specs])
+
+    assert graph.dependencies_of("000.a") == ["000"]
+    assert graph.dependencies_of("004") == ["000.b", "001"]
+    assert graph.unknown == {"004": ["077"]}
+
+    schedule = build_schedule(graph)
+    assert schedule.waves == [["000"], ["000.a", "000.b", "001"], ["004"], ["004.a"], ["005"]]
+    assert schedule.critical_path == ["000", "001", "004", "004.a", "005"]
+    assert schedule.critical_points == 8 + 8 + 13 + 5 + 21
+
+
+def test_cycles_are_detected_or_grouped(corpus):
+    task_list, specs = corpus
+    (specs / "task-000.md").write_text(spec("000", "Task 005"), encoding="utf-8")
+    graph = build_graph(load_task_list(task_list), [specs])
+
+    assert find_cycles(graph) == [["000", "000.b", "001", "004", "004.a", "005"]]
+    with pytest.raises(CycleError) as exc:
+        topological_waves(graph)
+    assert "(000 -> 005 -> 004.a -> 004 -> " in str(exc.value)
+
+    waves = topological_waves(graph, allow_cycles=True)
+    assert waves == [["000", "000.b", "001", "004", "004.a", "005"], ["000.a"]]
+
+
+def test_generation_and_refinement_consume_waves(corpus, tmp_path: Path):
+    task_list, specs = corpus
+    model = load_task_list(task_list)
+    graph = build_graph(model, [specs])
+    wave = set(build_schedule(graph).waves[1])
+
+    written = generate_stubs(model.tasks, tmp_path / "stubs", graph, wave)
+    assert sorted(p.name[:9] for p in written) == ["task-000a", "task-000b", "task-001-"]
+    assert "**Dependencies:** Task 000  " in (tmp_path / "stubs" / written[-1].name).read_text(encoding="utf-8")
+
+    all_stubs = generate_stubs(model.tasks, tmp_path / "all", graph)
+    text = {p.name[:9]: p.read_text(encoding="utf-8") for p in all_stubs}
+    assert "**Dependencies:** Task 000.b, Task 001  " in text["task-004-"]
+    assert "**Dependencies:** None  " in text["task-000-"]
+
+    refined = refine_tree(tmp_path / "all", tmp_path / "refined", model, "all", wave)
+    assert sorted(p.name[:9] for p in refined) == ["task-000a", "task-000b", "task-001-"]
+
+
+def test_graph_cache_rebuilds_on_spec_change(corpus):
+    task_list, specs = corpus
+    model = load_task_list(task_list)
+    cache = GraphCache()
+    assert cache.get(model, [specs]) is cache.get(model, [specs])
+    (specs / "task-005.md").write_text(spec("005", "Task 001"), encoding="utf-8")
+    assert cache.get(model, [specs]).dependencies_of("005") == ["001"]
+    assert cache.builds == 2
+
+
+def test_cli_and_daemon(corpus, capsys):
+    task_list, specs = corpus
+    assert spectools_main(["schedule", "--task-list", str(task_list), "--specs", str(specs), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["critical_points"] == 55
+    assert spectools_main(["stubs", "--task-list", str(task_list), "--specs", str(specs),
+                           "--out", str(specs / "out"), "--wave", "9"]) == 2
+
+    d = Dispatcher(task_list)
+    result = d.schedule({"specs": [str(specs)]})
+    assert result["waves"][0] == ["000"]
+    (specs / "task-000.md").write_text(spec("000", "Task 001"), encoding="utf-8")
+    with pytest.raises(RpcError):
+        d.schedule({"specs": [str(specs)]})
+    assert d.schedule({"specs": [str(specs)], "allow_cycles": True})["cycles"] == [["000", "001"]]
+
+
+def test_wrapper_reads_repeated_specs(corpus, tmp_path: Path, monkeypatch):
+    task_list, specs = corpus
+    more = tmp_path / "more-specs"
+    more.mkdir()
+    (specs / "task-004.md").rename(more / "task-004.md")
+    stubs = load_script("generate-acode-task-stubs.py")
+    monkeypatch.setattr("sys.argv", ["generate-acode-task-stubs.py", "--task-list", str(task_list),
+                                     "--out", str(tmp_path / "out"), "--specs", str(specs), "--specs", str(more)])
+    stubs.main()
+    text = {p.name[:9]: p.read_text(encoding="utf-8") for p in (tmp_path / "out").iterdir()}
+    assert "**Dependencies:** Task 000.b, Task 001  " in text["task-004-"]
+    assert "**Dependencies:** Task 004.a  " in text["task-005-"]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for spectools.snapshot (Merkle section-hash snapshots)."""
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import docs_scripts  # noqa: F401  (puts docs/scripts on sys.path)
+
+from spectools.snapshot import ObjectStore, create_snapshot, diff_snapshots, split_sections
+
+DOC = "intro\n# Task 001\n## Description\ntext\n```bash\n# not a heading\n```\n## Notes\na\n## Notes\nb\n"
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    root = tmp_path / "corpus"
+    (root / "Epic 00").mkdir(parents=True)
+    (root / "Epic 00" / "task-001.md").write_text(DOC, encoding="utf-8")
+    (root / "Epic 00" / "task-002.md").write_text("# Task 002\n## Description\nx\n", encoding="utf-8")
+    (root / "readme.md").write_text("# Readme\n", encoding="utf-8")
+    return root
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    s = ObjectStore(tmp_path / "store")
+    yield s
+    s.close()
+
+
+def test_split_sections_keys():
+    keys = [k for k, _ in split_sections(DOC)]
+    assert keys == ["(preamble)", "Task 001", "Task 001 > Description", "Task 001 > Notes", "Task 001 > Notes [2]"]
+    assert "# not a heading" in dict(split_sections(DOC))["Task 001 > Description"]
+
+
+def test_sections_round_trip():
+    assert "".join(text for _, text in split_sections(DOC)) == DOC
+
+
+def test_identical_snapshots_share_root_and_objects(corpus: Path, store: ObjectStore):
+    first = create_snapshot(corpus, store, "a")
+    assert store.stats.objects_written > 0
+    second = create_snapshot(corpus, store, "b")
+    assert first == second
+    assert store.stats.objects_written == 0
+    assert store.stats.documents_from_cache == 3
+    assert diff_snapshots(store, store.resolve("a"), store.resolve("b")).changes == []
+
+
+def test_refs_record_per_snapshot_counts(corpus: Path, store: ObjectStore):
+    create_snapshot(corpus, store, "one")
+    create_snapshot(corpus, store, "two")
+    counts = {r["name"]: (r["documents"], r["sections"]) for r in store.list_refs()}
+    assert counts["one"] == counts["two"] == (3, 8)
+
+
+def test_utf16_documents_split_into_sections(corpus: Path, store: ObjectStore):
+    doc = corpus / "Epic 00" / "task-003.md"
+    doc.write_bytes(DOC.encode("utf-16"))
+    create_snapshot(corpus, store, "before")
+    doc.write_bytes(DOC.replace("\na\n", "\nchanged\n").encode("utf-16"))
+    create_snapshot(corpus, store, "after")
+
+    changes = diff_snapshots(store, store.resolve("before"), store.resolve("after")).changes
+    assert [(c.kind, c.path, c.section) for c in changes] == [("changed", "Epic 00/task-003.md", "Task 001 > Notes")]
+
+
+def test_diff_lists_section_changes(corpus: Path, store: ObjectStore):
+    create_snapshot(corpus, store, "before")
+    doc = corpus / "Epic 00" / "task-001.md"
+    doc.write_text(DOC.replace("## Description\ntext", "## Description\nnew text") + "## Extra\nz\n", encoding="utf-8")
+    (corpus / "readme.md").unlink()
+    create_snapshot(corpus, store, "after")
+
+    result = diff_snapshots(store, store.resolve("before"), store.resolve("after"))
+    got = {(c.kind, c.path, c.section) for c in result.changes}
+    assert got == {
+        ("changed", "Epic 00/task-001.md", "Task 001 > Description"),
+        ("added", "Epic 00/task-001.md", "Task 001 > Extra"),
+        ("removed", "readme.md", "Readme"),
+    }
+    # Unchanged task-002.md is never loaded: root trees + Epic 00 trees + two task-001 docs + one readme doc.
+    assert result.nodes_visited == 7
+
+
+def test_zip_source_matches_directory(corpus: Path, store: ObjectStore, tmp_path: Path):
+    archive = tmp_path / "corpus.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for p in sorted(corpus.rglob("*.md")):
+            zf.write(p, p.relative_to(corpus).as_posix())
+    assert create_snapshot(archive, store) == create_snapshot(corpus, store)
+
+
+def test_unknown_snapshot(store: ObjectStore):
+    with pytest.raises(KeyError):
+        store.resolve("nope")
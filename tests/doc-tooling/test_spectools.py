@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for the docs/scripts/spectools package and its JSON-RPC daemon."""
+
+import io
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from docs_scripts import REPO_ROOT, SCRIPTS_DIR
+
+from spectools.daemon import Dispatcher, RpcError, call, make_socket_server, serve_stdio
+from spectools.refine import refine_task_doc
+from spectools.stubs import generate_stubs, render_stub
+from spectools.tasklist import TaskModelCache, load_task_list
+
+TASK_LIST = """# Full task list
+
+## EPIC 0 — Foundations
+
+### Task 000: Project Bootstrap
+
+#### Create solution
+
+#### Add docs
+
+## EPIC 1 — Runtime
+
+### Task 004: Model Provider Interface
+"""
+
+
+@pytest.fixture
+def task_list(tmp_path: Path) -> Path:
+    path = tmp_path / "task-list.md"
+    path.write_text(TASK_LIST, encoding="utf-8")
+    return path
+
+
+class TestImport:
+    def test_import_has_no_side_effects(self, tmp_path: Path):
+        # The pre-package script created tasks/stubs next to itself at import time.
+        code = "import spectools, spectools.stubs, spectools.refine, spectools.daemon"
+        subprocess.run([sys.executable, "-c", code], cwd=tmp_path, check=True,
+                       env={"PYTHONPATH": str(SCRIPTS_DIR)})
+        assert list(tmp_path.iterdir()) == []
+        assert not (SCRIPTS_DIR / "tasks").exists()
+
+    def test_templates_load_lazily(self):
+        code = "import sys, spectools; spectools.parse_task_list(''); print('spectools.templates' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                             env={"PYTHONPATH": str(SCRIPTS_DIR)}).stdout
+        assert out.strip() == "False"
+
+    def test_cli_imports_without_unix_sockets(self, task_list: Path):
+        # CPython on Windows has no AF_UNIX / UnixStreamServer; only `serve --socket` needs them.
+        code = ("import socket, socketserver; del socket.AF_UNIX; del socketserver.UnixStreamServer\n"
+                "import spectools.daemon\n"
+                "from spectools.__main__ import main\n"
+                f"raise SystemExit(main(['parse', '--task-list', {str(task_list)!r}]))")
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                       env={"PYTHONPATH": str(SCRIPTS_DIR)})
+
+
+class TestGeneration:
+    def test_parse_and_maps(self, task_list: Path):
+        model = load_task_list(task_list)
+        assert [t.number for t in model.tasks] == [0, 4]
+        assert model.task_map[0]["subs"] == ["Create solution", "Add docs"]
+        assert model.epic_map["EPIC 1"]["tasks"] == [(4, "Model Provider Interface", [])]
+
+    def test_generate_stubs_names(self, task_list: Path, tmp_path: Path):
+        written = generate_stubs(load_task_list(task_list).tasks, tmp_path / "out")
+        assert [p.name for p in written] == [
+            "task-000-project-bootstrap (NEEDS-REFINEMENT).md",
+            "task-000a-create-solution (NEEDS-REFINEMENT).md",
+            "task-000b-add-docs (NEEDS-REFINEMENT).md",
+            "task-004-model-provider-interface (NEEDS-REFINEMENT).md",
+        ]
+
+    def test_refine_injects_canonical_context(self, task_list: Path):
+        model = load_task_list(task_list)
+        _, stub = render_stub(model.tasks[0], 1)
+        refined = refine_task_doc(stub, model)
+        assert refined.startswith("# INSTRUCTIONS FOR CLAUDE TO COMPLETE THIS TASK (REFINED SPEC TARGET)")
+        assert "**Canonical Task Title:** Task 000.b: Add docs" in refined
+        assert refined.count("# INSTRUCTIONS FOR CLAUDE") == 1
+
+    def test_cache_reparses_only_on_change(self, task_list: Path):
+        cache = TaskModelCache()
+        first = cache.get(task_list)
+        assert cache.get(task_list) is first
+        task_list.write_text(TASK_LIST + "\n### Task 005: Ollama Provider Adapter\n", encoding="utf-8")
+        assert [t.number for t in cache.get(task_list).tasks] == [0, 4, 5]
+        assert cache.parses == 2
+
+
+class TestDaemon:
+    def test_dispatch_errors(self, task_list: Path):
+        d = Dispatcher(task_list)
+        assert d.handle({"jsonrpc": "2.0", "id": 1, "method": "nope"})["error"]["code"] == -32601
+        assert d.handle({"jsonrpc": "2.0", "id": 2, "method": "render_stub", "params": {}})["error"]["code"] == -32602
+        assert json.loads(d.handle_line("{not json"))["error"]["code"] == -32700
+        assert d.handle({"jsonrpc": "2.0", "method": "ping"}) is None
+
+    def test_stdio_session(self, task_list: Path):
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "parse"},
+            {"jsonrpc": "2.0", "id": 2, "method": "render_stub", "params": {"task": 0, "sub": 0}},
+            {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 4, "method": "ping"},
+        ]
+        stdout = io.StringIO()
+        serve_stdio(Dispatcher(task_list), io.StringIO("\n".join(json.dumps(r) for r in requests)), stdout)
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [r["id"] for r in responses] == [1, 2, 3]
+        assert len(responses[0]["result"]["tasks"]) == 2
+        assert responses[1]["result"]["filename"] == "task-000a-create-solution (NEEDS-REFINEMENT).md"
+
+    def test_socket_keeps_model_warm(self, task_list: Path, tmp_path: Path):
+        sock = tmp_path / "d.sock"
+        server = make_socket_server(Dispatcher(task_list), sock)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for _ in range(3):
+                call(sock, "parse")
+            assert call(sock, "ping")["parses"] == 1
+            with pytest.raises(RpcError):
+                call(sock, "render_stub", {"task": 999})
+            assert call(sock, "shutdown") is True
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        finally:
+            server.server_close()
+
+
+def test_real_task_list_parses():
+    model = load_task_list(REPO_ROOT / "docs" / "tasks" / "task-list.md")
+    assert model.tasks and model.tasks[0].number == 0
@@ -0,0 +1,20 @@
+"""Helpers for importing the scripts/ tooling from tests."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+
+def load_script(filename: str):
+    """Import a hyphen-named script from scripts/ as a module."""
+    name = filename.replace("-", "_").removesuffix(".py")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
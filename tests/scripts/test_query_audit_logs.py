@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Tests for scripts/query-audit-logs.py."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from repo_scripts import load_script
+
+qal = load_script("query-audit-logs.py")
+
+
+def event(n: int, session: str, corr: str, event_type: str, span=None, parent=None) -> str:
+    return json.dumps({
+        "schemaVersion": "1.0.0", "eventId": f"evt_{n}", "timestamp": f"2026-01-11T15:31:{n:02d}.0000000Z",
+        "sessionId": session, "correlationId": corr, "spanId": span, "parentSpanId": parent,
+        "eventType": event_type, "severity": "Info", "source": "Acode.Cli", "operatingMode": "LocalOnly",
+        "data": {}, "context": None,
+    }, separators=(",", ":"))
+
+
+SESSION_A = [
+    event(0, "sess_a", "corr_1", "SessionStart"),
+    event(1, "sess_a", "corr_2", "CommandStart", "span_cmd"),
+    event(2, "sess_a", "corr_2", "FileWrite", "span_file", "span_cmd"),
+    event(3, "sess_a", "corr_2", "FileRead", "span_read", "span_file"),
+    event(4, "sess_a", "corr_2", "CommandEnd", "span_cmd"),
+    event(5, "sess_a", "corr_3", "ToolCall", "span_tool", "span_gone"),
+]
+
+
+@pytest.fixture
+def logs(tmp_path: Path) -> Path:
+    d = tmp_path / "logs"
+    d.mkdir()
+    (d / "session_sess_a_20260111_153045.jsonl").write_text("\n".join(SESSION_A) + "\n", encoding="utf-8")
+    (d / "session_sess_b_20260111_160000.jsonl").write_text(
+        event(10, "sess_b", "corr_9", "SessionStart") + "\nnot json\n", encoding="utf-8")
+    return d
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    conn = qal.connect(tmp_path / "index.sqlite")
+    yield conn
+    conn.close()
+
+
+def find(db, **filters):
+    return [qal.event_field(json.loads(line), "eventId") for line in qal.read_events(qal.query_locations(db, qal.Filters(**filters)))]
+
+
+def test_index_and_lookup(logs: Path, db):
+    stats = qal.update_index(db, [logs], jobs=1)
+    assert (stats.files_scanned, stats.events_added, stats.invalid_lines) == (2, 7, 1)
+    assert find(db, correlation="corr_2") == ["evt_1", "evt_2", "evt_3", "evt_4"]
+    assert find(db, session="sess_a", event_type="FileWrite") == ["evt_2"]
+    assert find(db, since="2026-01-11T15:31:04", until="2026-01-11T15:31:06") == ["evt_4", "evt_5"]
+
+
+def test_incremental_update_parses_only_new_bytes(logs: Path, db):
+    qal.update_index(db, [logs], jobs=1)
+    assert qal.update_index(db, [logs], jobs=1).files_scanned == 0
+
+    log = logs / "session_sess_a_20260111_153045.jsonl"
+    before = log.stat().st_size
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(event(6, "sess_a", "corr_2", "FileDelete", "span_del", "span_cmd") + "\n")
+        f.write('{"partial":')  # writer mid-line: left for the next run
+    stats = qal.update_index(db, [logs], jobs=1)
+    assert stats.events_added == 1
+    assert stats.bytes_scanned < log.stat().st_size - before
+    assert find(db, correlation="corr_2")[-1] == "evt_6"
+
+
+def test_rewritten_and_deleted_files(logs: Path, db):
+    qal.update_index(db, [logs], jobs=1)
+    log = logs / "session_sess_a_20260111_153045.jsonl"
+    log.write_text(SESSION_A[0] + "\n", encoding="utf-8")
+    (logs / "session_sess_b_20260111_160000.jsonl").unlink()
+    stats = qal.update_index(db, [logs], jobs=1)
+    assert (stats.files_reset, stats.files_removed) == (1, 1)
+    assert find(db) == ["evt_0"]
+
+
+def test_span_tree_reconstruction(logs: Path, db):
+    qal.update_index(db, [logs], jobs=1)
+    events = [json.loads(line) for line in qal.read_events(qal.query_locations(db, qal.Filters(session="sess_a")))]
+    roots = qal.build_span_trees(events)
+
+    assert [r.span_id for r in roots] == [None, "span_cmd", "span_tool"]
+    cmd = roots[1]
+    assert [e["eventType"] for e in cmd.events] == ["CommandStart", "CommandEnd"]
+    assert [c.span_id for c in cmd.children] == ["span_file"]
+    assert [c.span_id for c in cmd.children[0].children] == ["span_read"]
+    assert roots[2].orphan and not cmd.orphan
+    assert "orphan: parent span_gone not found" in qal.format_tree(roots)
+
+
+def writer_event(n: int, session: str, corr: str, event_type: int, span=None, parent=None) -> str:
+    """An event as FileAuditWriter serializes it: snake_case keys, id records as {"value": ...}, enum as int."""
+    wrap = lambda v: {"value": v} if v else None  # noqa: E731
+    return json.dumps({
+        "schema_version": "1.0.0", "event_id": wrap(f"evt_w{n}"), "timestamp": f"2026-01-11T16:00:{n:02d}+00:00",
+        "session_id": wrap(session), "correlation_id": wrap(corr), "span_id": wrap(span),
+        "parent_span_id": wrap(parent), "event_type": event_type, "severity": 0, "source": "Acode.Cli",
+        "operating_mode": "LocalOnly", "data": {}, "context": None,
+    }, separators=(",", ":"))
+
+
+def test_file_audit_writer_format(tmp_path: Path, db):
+    d = tmp_path / "writer"
+    d.mkdir()
+    (d / "audit-20260111.jsonl").write_text("\n".join([
+        writer_event(0, "sess_w", "corr_w", 0, "span_root"),
+        writer_event(1, "sess_w", "corr_w", 9, "span_child", "span_root"),
+    ]) + "\n", encoding="utf-8")
+    qal.update_index(db, [d], jobs=1)
+
+    assert find(db, session="sess_w") == ["evt_w0", "evt_w1"]
+    assert find(db, event_type="FileWrite") == ["evt_w1"]
+    assert find(db, event_type="file_write") == find(db, event_type="9") == ["evt_w1"]
+    events = [json.loads(line) for line in qal.read_events(qal.query_locations(db, qal.Filters(correlation="corr_w")))]
+    roots = qal.build_span_trees(events)
+    assert [r.span_id for r in roots] == ["span_root"]
+    assert [c.span_id for c in roots[0].children] == ["span_child"]
+    assert "evt_w1" in qal.format_tree(roots)
+
+
+def test_cli_type_matches_writer_int_and_snake_case(tmp_path: Path, capsys):
+    d = tmp_path / "writer"
+    d.mkdir()
+    snake = json.loads(writer_event(1, "sess_j", "corr_j", 0))
+    snake["event_type"] = "file_write"  # JsonAuditLogger's JsonStringEnumConverter(SnakeCaseNamingPolicy)
+    (d / "audit.jsonl").write_text(writer_event(0, "sess_w", "corr_w", 9) + "\n" + json.dumps(snake) + "\n",
+                                   encoding="utf-8")
+    assert qal.main(["find", str(d), "--index", str(tmp_path / "cli.sqlite"), "--type", "FileWrite"]) == 0
+    ids = [qal.event_field(json.loads(line), "eventId") for line in capsys.readouterr().out.splitlines()]
+    assert ids == ["evt_w0", "evt_w1"]
+
+
+def test_index_built_before_value_normalisation_is_rebuilt(tmp_path: Path):
+    path = tmp_path / "old.sqlite"
+    old = qal.connect(path)
+    old.execute("INSERT INTO files (path, size, mtime_ns, indexed_offset) VALUES ('x', 1, 1, 1)")
+    old.execute("PRAGMA user_version = 1")
+    old.commit()
+    old.close()
+    conn = qal.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+    conn.close()
+
+
+def test_shared_index_keeps_sibling_roots_apart(tmp_path: Path, db):
+    logs, logs2 = tmp_path / "logs", tmp_path / "logs2"
+    for d, session in ((logs, "sess_a"), (logs2, "sess_b")):
+        d.mkdir()
+        (d / f"session_{session}.jsonl").write_text(event(0, session, "corr_x", "SessionStart") + "\n",
+                                                    encoding="utf-8")
+    qal.update_index(db, [logs, logs2], jobs=1)
+
+    assert qal.update_index(db, [logs], jobs=1).files_removed == 0
+    located = qal.query_locations(db, qal.Filters(correlation="corr_x", roots=[logs2]))
+    assert [Path(p).parent for p, _, _ in located] == [logs2.resolve()]
+    assert len(qal.query_locations(db, qal.Filters(correlation="corr_x"))) == 2
+
+
+def test_cli_find_and_tree(logs: Path, tmp_path: Path, capsys):
+    index = str(tmp_path / "cli.sqlite")
+    assert qal.main(["find", str(logs), "--index", index, "--correlation", "corr_9"]) == 0
+    assert json.loads(capsys.readouterr().out)["eventId"] == "evt_10"
+    assert qal.main(["tree", str(logs), "--index", index, "--correlation", "corr_2", "--json"]) == 0
+    tree = json.loads(capsys.readouterr().out)
+    assert tree[0]["spanId"] == "span_cmd" and tree[0]["children"][0]["spanId"] == "span_file"
+    assert qal.main(["find", str(logs), "--index", index, "--correlation", "nope"]) == 1
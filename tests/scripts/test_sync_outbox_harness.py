@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for scripts/sync-outbox-harness.py."""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from repo_scripts import load_script
+
+harness = load_script("sync-outbox-harness.py")
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Path:
+    path = tmp_path / "outbox.db"
+    harness.create_database(path)
+    return path
+
+
+def test_database_uses_real_migrations(db: Path):
+    conn = harness.connect(db)
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_sync_outbox_status", "idx_sync_outbox_created"} <= indexes
+
+
+def test_batch_claims_never_overlap(db: Path):
+    conn = harness.connect(db)
+    harness.insert_rows(conn, harness.LockStats(), harness.make_rows(500, "{}"))
+
+    claimed = []
+    lock = threading.Lock()
+
+    def claimer():
+        c = harness.connect(db)
+        stats = harness.LockStats()
+        while True:
+            rows = harness.run_write(c, stats, harness.CLAIM_BATCH, (37,))
+            if not rows:
+                return
+            with lock:
+                claimed.extend(r[0] for r in rows)
+
+    threads = [threading.Thread(target=claimer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(claimed) == len(set(claimed)) == 500
+
+
+def test_ack_batch_marks_completed(db: Path):
+    conn = harness.connect(db)
+    stats = harness.LockStats()
+    harness.insert_rows(conn, stats, harness.make_rows(5, "{}"))
+    ids = [r[0] for r in harness.run_write(conn, stats, harness.CLAIM_BATCH, (3,))]
+    harness.run_write(conn, stats, harness.ACK_BATCH, (harness.utc_now(), json.dumps(ids)))
+    counts = dict(conn.execute("SELECT status, COUNT(*) FROM sync_outbox GROUP BY status"))
+    assert counts == {"completed": 3, "pending": 2}
+
+
+def test_in_transaction_retries_busy_body_and_counts_it(db: Path):
+    conn = harness.connect(db)
+    stats = harness.LockStats()
+    attempts = []
+
+    def body(c):
+        c.executemany(harness.INSERT_SQL, harness.make_rows(1, "{}"))
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return len(attempts)
+
+    assert harness.in_transaction(conn, stats, body) == 2
+    assert stats.busy_retries == 1
+    assert conn.execute("SELECT COUNT(*) FROM sync_outbox").fetchone()[0] == 1  # first attempt rolled back
+    with pytest.raises(sqlite3.OperationalError):
+        harness.in_transaction(conn, stats, lambda c: c.execute("SELECT * FROM no_such_table"))
+    assert stats.busy_retries == 1
+
+
+@pytest.mark.parametrize("strategy,drainers", [("row", 1), ("batch", 2)])
+def test_scenario_drains_backlog(tmp_path: Path, strategy: str, drainers: int):
+    scenario = harness.Scenario(strategy=strategy, batch_size=25, drainers=drainers, rate=0, prefill=200,
+                                latency_ms=0, per_row_us=0, drain_timeout=20)
+    result = harness.run_scenario(scenario, tmp_path)
+    assert result.drained == 200
+    assert result.remaining == 0
+    assert result.duplicates == 0
+    assert result.lag_ms["max"] >= result.lag_ms["p50"] >= 0
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for scripts/verify-audit-logs.py."""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from repo_scripts import load_script
+
+val = load_script("verify-audit-logs.py")
+
+
+def event(n: int) -> str:
+    return json.dumps({"schemaVersion": "1.0.0", "eventId": f"evt_{n}", "sessionId": "sess_x1y2z3",
+                       "eventType": "FileWrite", "data": {"path": f"src/{n}.cs"}}, separators=(",", ":"))
+
+
+def write_per_line(log: Path, lines) -> None:
+    with open(log, "a", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in lines)
+    with open(str(log) + ".checksum", "a", encoding="ascii") as f:
+        f.writelines(hashlib.sha256(line.encode()).hexdigest() + "\n" for line in lines)
+
+
+def write_whole(log: Path, lines) -> None:
+    body = "".join(line + "\n" for line in lines).encode()
+    log.write_bytes(body)
+    Path(str(log) + ".sha256").write_text(hashlib.sha256(body).hexdigest(), encoding="ascii")
+
+
+@pytest.fixture
+def logs(tmp_path: Path) -> Path:
+    d = tmp_path / "logs"
+    d.mkdir()
+    write_per_line(d / "session_sess_a_20260111_140000.jsonl", [event(i) for i in range(50)])
+    write_whole(d / "session_sess_b_20260111_153045.jsonl", [event(i) for i in range(50)])
+    return d
+
+
+def run(logs: Path, state: dict, full: bool = False):
+    jobs, outcomes, skipped = val.plan(list(val.iter_logs([logs])), state, full)
+    outcomes += val.run_jobs(jobs, 1)
+    val.record(state, outcomes)
+    return {Path(o.path).name: o for o in outcomes}, skipped
+
+
+def test_both_sidecar_formats_verify(logs: Path):
+    outcomes, skipped = run(logs, {})
+    assert skipped == 0
+    assert {o.status for o in outcomes.values()} == {val.OK}
+    assert {o.mode for o in outcomes.values()} == {"lines", "file"}
+
+
+def test_unchanged_logs_are_skipped(logs: Path):
+    state = {}
+    run(logs, state)
+    outcomes, skipped = run(logs, state)
+    assert outcomes == {} and skipped == 2
+
+
+def test_growing_log_is_verified_from_last_offset(logs: Path):
+    state = {}
+    run(logs, state)
+    log = logs / "session_sess_a_20260111_140000.jsonl"
+    size_before = log.stat().st_size
+    write_per_line(log, [event(i) for i in range(50, 60)])
+
+    outcomes, skipped = run(logs, state)
+    o = outcomes[log.name]
+    assert skipped == 1
+    assert o.status == val.OK and o.lines == 60
+    assert o.bytes_hashed == log.stat().st_size - size_before - 10  # new lines minus their newlines
+
+
+@pytest.mark.parametrize("grow_log", [False, True])
+def test_tampered_checksum_sidecar_forces_full_reverify(logs: Path, grow_log: bool):
+    state = {}
+    run(logs, state)
+    log = logs / "session_sess_a_20260111_140000.jsonl"
+    sidecar = Path(str(log) + ".checksum")
+    digests = sidecar.read_text(encoding="ascii").splitlines()
+    digests[5] = "0" * 64
+    sidecar.write_text("".join(d + "\n" for d in digests), encoding="ascii")
+    if grow_log:
+        write_per_line(log, [event(50)])
+
+    outcomes, _ = run(logs, state)
+    assert outcomes[log.name].status == val.MISMATCH
+    assert "line 6" in outcomes[log.name].detail
+
+
+def test_tampered_line_is_detected(logs: Path):
+    log = logs / "session_sess_a_20260111_140000.jsonl"
+    log.write_text(log.read_text(encoding="utf-8").replace("src/7.cs", "src/X.cs"), encoding="utf-8")
+    outcomes, _ = run(logs, {})
+    assert outcomes[log.name].status == val.MISMATCH
+    assert "line 8" in outcomes[log.name].detail
+
+
+def test_truncation_and_lagging_checksum(logs: Path):
+    log = logs / "session_sess_a_20260111_140000.jsonl"
+    lines = log.read_text(encoding="utf-8").splitlines(keepends=True)
+    log.write_text("".join(lines[:-1]), encoding="utf-8")
+    outcomes, _ = run(logs, {})
+    assert outcomes[log.name].status == val.MISMATCH
+
+    log.write_text("".join(lines) + event(99) + "\n", encoding="utf-8")
+    outcomes, _ = run(logs, {})
+    assert outcomes[log.name].status == val.PARTIAL
+
+
+def test_whole_file_mismatch_and_missing_sidecar(logs: Path):
+    log = logs / "session_sess_b_20260111_153045.jsonl"
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(event(1000) + "\n")
+    (logs / "session_sess_c_20260111_160000.jsonl").write_text(event(0) + "\n", encoding="utf-8")
+    outcomes, _ = run(logs, {})
+    assert outcomes[log.name].status == val.MISMATCH
+    assert outcomes["session_sess_c_20260111_160000.jsonl"].status == val.NO_CHECKSUM
+
+
+def test_follow_hashes_only_appended_bytes(logs: Path):
+    log = logs / "session_sess_b_20260111_153045.jsonl"
+    follower = val.Follower({})
+    first = {Path(o.path).name: o for o in follower.poll([log])}
+    assert first[log.name].status == val.OK
+
+    lines = [event(i) for i in range(55)]
+    write_whole(log, lines)
+    appended = len("".join(line + "\n" for line in lines[50:]))
+    second = {Path(o.path).name: o for o in follower.poll([log])}
+    assert second[log.name].status == val.OK
+    assert second[log.name].bytes_hashed == appended
+
+
+def test_main_exit_code(logs: Path, tmp_path: Path):
+    state = tmp_path / "state.json"
+    assert val.main([str(logs), "--state", str(state), "--jobs", "2"]) == 0
+    assert val.main([str(logs), "--state", str(state)]) == 0
+    (logs / "session_sess_b_20260111_153045.jsonl.sha256").write_text("0" * 64, encoding="ascii")
+    assert val.main([str(logs), "--state", str(state)]) == 1